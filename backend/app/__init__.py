@@ -49,15 +49,29 @@ def create_app():
     def missing_token_callback(error):
         return jsonify({'error': '토큰이 필요합니다'}), 401
     
-    # Socket.IO 초기화 (eventlet 사용, 모든 오리진 허용)
+    # Socket.IO 초기화 (eventlet 사용, 모든 오리진 허용, 메시지 큐 설정 시 다중 워커)
+    from app.utils.pubsub import socketio_queue_options
+    message_queue = app.config.get('SOCKETIO_MESSAGE_QUEUE')
     socketio.init_app(app,
                      cors_allowed_origins="*",
-                     async_mode='eventlet')
+                     async_mode='eventlet',
+                     **socketio_queue_options(message_queue))
     
-    # 데이터베이스 연결
-    from app.utils.database import init_db
+    # 데이터베이스 연결 (블로킹 I/O가 이벤트 루프를 멈추지 않는지 먼저 확인)
+    from app.utils.database import init_db, check_cooperative_io
+    check_cooperative_io(socketio.async_mode, app.config.get('COOPERATIVE_IO_CHECK', 'error'))
     init_db()
     
+    # 비밀번호 해셔 초기화 (bcrypt 라운드, 동시 실행 수)
+    from app.utils.password_hasher import password_hasher
+    password_hasher.init_app(app)
+    
+    # 랭킹 캐시 초기화
+    from app.utils.ranking_cache import ranking_cache
+    ranking_cache.init_app(app)
+    from app.utils.rank_index import user_rank_index
+    user_rank_index.init_app(app, socketio)
+    
     # 블루프린트 등록
     from app.routes.main import main_bp
     from app.routes.docs import docs_bp, swaggerui_blueprint
@@ -71,6 +85,40 @@ def create_app():
     from app.socket_events.handlers import register_all_events
     register_all_events(socketio)
     
+    # 다중 워커 간 진행 중인 방 상태 동기화
+    if message_queue:
+        from app.utils.pubsub import create_pubsub
+        from app.utils.room_registry import room_registry
+        room_registry.init_pubsub(create_pubsub(message_queue, 'jungle-tetris:rooms'), socketio)
+    
+    # 점수 브로드캐스트 티커 초기화
+    from app.socket_events.score_ticker import score_broadcaster
+    score_broadcaster.init_app(app, socketio)
+    
+    # 상대 보드 브로드캐스트 티커 초기화
+    from app.socket_events.board_ticker import board_broadcaster
+    board_broadcaster.init_app(app, socketio)
+    
+    # 관전자 브로드캐스트 티커 초기화
+    from app.socket_events.spectator_ticker import spectator_broadcaster
+    spectator_broadcaster.init_app(app, socketio, board_source=board_broadcaster)
+    
+    # 게임 중 점수 write-behind 초기화
+    from app.utils.score_write_behind import score_write_behind
+    score_write_behind.init_app(app, socketio)
+    
+    # 리플레이 점수 검증기 초기화
+    from app.utils.replay_verifier import replay_verifier
+    replay_verifier.init_app(app, socketio)
+    
+    # 게임 기록 일괄 저장 대기열 초기화
+    from app.utils.record_ingest import record_ingest
+    record_ingest.init_app(app, socketio)
+    
+    # 대전 종료 커밋 파이프라인 초기화
+    from app.utils.match_commit import match_committer
+    match_committer.init_app(app, socketio)
+    
     # 기본 라우트
     @app.route('/')
     def index():
@@ -93,14 +141,25 @@ def create_app():
         """헬스 체크 엔드포인트"""
         try:
             # 데이터베이스 연결 확인
-            from app.utils.database import get_db
+            from app.utils.database import get_db, pool_metrics
             db = get_db()
             db.command('ping')
             
+            from app.utils.score_write_behind import score_write_behind
+            from app.utils.replay_verifier import replay_verifier
+            from app.utils.match_commit import match_committer
+            from app.utils.record_ingest import record_ingest
+            from app.utils.stall_detector import stall_detector
             return jsonify({
                 'status': 'healthy',
                 'timestamp': datetime.utcnow().isoformat(),
                 'database': 'connected',
+                'mongo_pool': pool_metrics.stats(),
+                'score_write_behind': score_write_behind.stats(),
+                'replay_verifier': replay_verifier.stats(),
+                'match_commit': match_committer.stats(),
+                'record_ingest': record_ingest.stats(),
+                'stall_detector': stall_detector.stats(),
                 'version': '1.0.0'
             })
         except Exception as e:
@@ -111,6 +170,12 @@ def create_app():
                 'timestamp': datetime.utcnow().isoformat()
             }), 503
     
+    @app.route('/metrics')
+    def metrics_endpoint():
+        """Prometheus 텍스트 형식 메트릭"""
+        from app.utils.metrics import metrics
+        return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+    
     # 에러 핸들러
     @app.errorhandler(404)
     def not_found(error):
@@ -125,4 +190,8 @@ def create_app():
         app.logger.error(f"Internal server error: {str(error)}")
         return jsonify({'error': '서버 내부 오류가 발생했습니다'}), 500
     
+    # 이벤트 루프 정지 감지기 (모든 라우트 등록 후 시작)
+    from app.utils.stall_detector import stall_detector
+    stall_detector.init_app(app, socketio)
+    
     return app
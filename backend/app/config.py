@@ -28,8 +28,29 @@ class Config:
     # MongoDB 설정
     MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/jungle_tetris')
     
+    # MongoDB 커넥션 풀 설정 (eventlet greenlet 동시성에 맞춰 조정)
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 100))                       # 최대 커넥션 수
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))                         # 최소 유지 커넥션 수
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 0)) or None           # 유휴 커넥션 종료 시간 (0이면 무제한)
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 0)) or None  # 커넥션 대기 제한 시간 (0이면 무제한)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 30000))  # 서버 선택 제한 시간
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', 20000))           # 연결 제한 시간
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', 0)) or None         # 소켓 읽기/쓰기 제한 시간 (0이면 무제한)
+    
     # Socket.IO 설정
     SOCKETIO_ASYNC_MODE = 'eventlet'
+    # 다중 워커 메시지 큐 (예: local://127.0.0.1:6390, redis://localhost:6379/0), 없으면 단일 워커
+    SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+    # 협력형 I/O 시작 확인 (eventlet monkey patch 누락 시 'error' 예외, 'warn' 경고, 'off' 확인 안 함)
+    COOPERATIVE_IO_CHECK = os.getenv('COOPERATIVE_IO_CHECK', 'error')
+    
+    # 이벤트 루프 정지 감지 설정
+    STALL_DETECTOR_ENABLED = os.getenv('STALL_DETECTOR_ENABLED', 'true').lower() == 'true'
+    STALL_HEARTBEAT_MS = float(os.getenv('STALL_HEARTBEAT_MS', 20))    # 하트비트 주기
+    STALL_THRESHOLD_MS = float(os.getenv('STALL_THRESHOLD_MS', 100))   # 정지로 기록할 루프 지연
+    STALL_LOG_PATH = os.getenv('STALL_LOG_PATH', 'logs/stalls.{pid}.log')  # 정지 스택 로그 경로 (상대 경로는 backend 기준, {pid}가 없으면 외부 회전)
+    STALL_LOG_MAX_BYTES = int(os.getenv('STALL_LOG_MAX_BYTES', 5 * 1024 * 1024))  # 워커별 로그 회전 크기 ({pid} 경로일 때)
+    STALL_LOG_BACKUPS = int(os.getenv('STALL_LOG_BACKUPS', 3))
     
     # Socket.IO 클라이언트 URL (프론트엔드에서 사용)
     SOCKET_URL = os.getenv('SOCKET_URL', 'http://localhost:8000')
@@ -43,8 +64,43 @@ class Config:
     MAX_ROOM_PLAYERS = 2  # 최대 2명
     ROOM_TIMEOUT = 600    # 10분 비활성 시 자동 삭제
     
+    # 실시간 브로드캐스트 설정
+    SCORE_BROADCAST_HZ = float(os.getenv('SCORE_BROADCAST_HZ', 10))  # 방별 초당 최대 점수 전송 횟수
+    BOARD_BROADCAST_HZ = float(os.getenv('BOARD_BROADCAST_HZ', 5))  # 방별 초당 최대 보드 전송 횟수
+    BOARD_KEYFRAME_TICKS = int(os.getenv('BOARD_KEYFRAME_TICKS', 25))  # 전체 보드 키프레임 전송 주기 (틱)
+    SPECTATOR_BROADCAST_HZ = float(os.getenv('SPECTATOR_BROADCAST_HZ', 2))  # 관전자 방별 초당 최대 전송 횟수
+    SCORE_FLUSH_INTERVAL = float(os.getenv('SCORE_FLUSH_INTERVAL', 5))  # 게임 중 점수 DB 반영 주기 (초)
+    MATCH_COMMIT_ASYNC = os.getenv('MATCH_COMMIT_ASYNC', 'true').lower() == 'true'  # 대전 종료 저장을 game:end 이후 백그라운드로 처리
+    MATCH_COMMIT_MAX_ATTEMPTS = int(os.getenv('MATCH_COMMIT_MAX_ATTEMPTS', 3))      # 대전 종료 저장 최대 시도 횟수
+    RECORD_INGEST_BATCH_SIZE = int(os.getenv('RECORD_INGEST_BATCH_SIZE', 100))      # 게임 기록 insert_many 묶음 크기
+    RECORD_INGEST_INTERVAL = float(os.getenv('RECORD_INGEST_INTERVAL', 1))          # 게임 기록 저장 주기 (초)
+    RECORD_INGEST_MAX_PENDING = int(os.getenv('RECORD_INGEST_MAX_PENDING', 5000))   # 대기 기록 상한 (초과 시 호출 측이 직접 저장)
+    RECORD_INGEST_MAX_ATTEMPTS = int(os.getenv('RECORD_INGEST_MAX_ATTEMPTS', 5))     # 기록별 최대 저장 시도 횟수 (초과 시 game_records_dead로 이동)
+    RECORD_INGEST_SYNC = os.getenv('RECORD_INGEST_SYNC', 'false').lower() == 'true'  # 대기열 없이 즉시 저장 (테스트용)
+    
+    # 리플레이 점수 검증 설정
+    REPLAY_VERIFY_WORKERS = int(os.getenv('REPLAY_VERIFY_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+    REPLAY_VERIFY_MAX_PENDING = int(os.getenv('REPLAY_VERIFY_MAX_PENDING', 32))  # 최대 대기 검증 수
+    REPLAY_VERIFY_TIMEOUT = float(os.getenv('REPLAY_VERIFY_TIMEOUT', 2.0))       # 검증당 제한 시간 (초)
+    REPLAY_VERIFY_FALLBACK = os.getenv('REPLAY_VERIFY_FALLBACK', 'accept')       # 포화/시간 초과 시 'accept' 또는 'reject'
+    REPLAY_VERIFY_REQUIRED = os.getenv('REPLAY_VERIFY_REQUIRED', 'false').lower() == 'true'  # 입력 로그 필수 여부
+    
     # 랭킹 설정
     MAX_RANKING_LIMIT = 100
+    RANK_SCORE_BUCKET = 10        # 순위 인덱스 점수 버킷 크기 (점수는 10점 단위)
+    RANK_SCORE_MAX = 1000000      # 순위 인덱스 최대 점수 (초과 점수는 마지막 버킷)
+    RANK_WINS_MAX = 100000        # 순위 인덱스 최대 승리 수
+    RANKING_REFRESH_INTERVAL = int(os.getenv('RANKING_REFRESH_INTERVAL', 60))  # 랭킹 캐시 DB 재조회 주기 (초)
+    RANK_INDEX_REBUILD_INTERVAL = int(os.getenv('RANK_INDEX_REBUILD_INTERVAL', 300))  # 순위 인덱스 DB 재생성 주기 (초, 다른 워커 갱신 보정)
+    SEASON_EPOCH = os.getenv('SEASON_EPOCH', '2025-01-01')             # 시즌 1 시작일 (UTC, YYYY-MM-DD)
+    SEASON_LENGTH_DAYS = int(os.getenv('SEASON_LENGTH_DAYS', 28))      # 시즌 길이 (일)
+    
+    # 관리자 설정
+    ADMIN_USER_IDS = [u.strip() for u in os.getenv('ADMIN_USER_IDS', '').split(',') if u.strip()]  # 관리자 사용자 ID 목록
+    PROFILER_MAX_SECONDS = float(os.getenv('PROFILER_MAX_SECONDS', 60))  # 프로파일링 최대 시간 (초)
+    PROFILER_MAX_HZ = int(os.getenv('PROFILER_MAX_HZ', 1000))            # 최대 샘플링 주기
     
     # 보안 설정
-    BCRYPT_LOG_ROUNDS = 12  # bcrypt 해싱 라운드
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))  # bcrypt 해싱 라운드
+    PASSWORD_HASH_CONCURRENCY = int(os.getenv('PASSWORD_HASH_CONCURRENCY', 4))        # 동시에 실행할 해싱/검증 수
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', 5))  # 해싱 대기 제한 시간 (초)
@@ -0,0 +1,3 @@
+"""
+서버 측 테트리스 게임 엔진 패키지
+"""
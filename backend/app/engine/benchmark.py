@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+엔진 처리량 벤치마크
+무작위 입력으로 여러 게임을 시뮬레이션하여 초당 처리한 이동 수를 측정합니다.
+
+사용법:
+    python -m app.engine.benchmark --games 1000 --moves 600
+"""
+import argparse
+import random
+import time
+
+from app.engine.game import TetrisGame, ACTIONS, MOVE_DOWN
+
+# 사람의 입력 분포에 가깝게 좌우 이동/회전을 많이, 하드 드롭은 가끔
+ACTION_WEIGHTS = (3, 3, 2, 2, 1)
+
+
+def run(games, moves_per_game, seed=0):
+    """벤치마크 실행 후 결과 반환"""
+    rng = random.Random(seed)
+    actions = rng.choices(ACTIONS, weights=ACTION_WEIGHTS, k=moves_per_game)
+
+    total_moves = 0
+    total_score = 0
+    started = time.perf_counter()
+    for game_index in range(games):
+        game = TetrisGame(seed=seed + game_index)
+        for action in actions:
+            if game.over:
+                # 게임 오버 시 새 게임으로 교체하여 처리량 유지
+                game = TetrisGame(seed=rng.getrandbits(32))
+            game.apply(action)
+            # 입력마다 중력 낙하도 함께 적용
+            game.apply(MOVE_DOWN)
+            total_moves += 2
+        total_score += game.score
+    elapsed = time.perf_counter() - started
+
+    return {
+        'games': games,
+        'moves': total_moves,
+        'elapsed': elapsed,
+        'moves_per_second': total_moves / elapsed if elapsed else 0.0,
+        'games_per_second': games / elapsed if elapsed else 0.0,
+        'average_score': total_score / games if games else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='테트리스 엔진 처리량 벤치마크')
+    parser.add_argument('--games', type=int, default=1000, help='시뮬레이션할 게임 수')
+    parser.add_argument('--moves', type=int, default=600, help='게임당 입력 수')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    args = parser.parse_args()
+
+    result = run(args.games, args.moves, args.seed)
+    print(f"🎮 games: {result['games']}")
+    print(f"⏱️  elapsed: {result['elapsed']:.3f}s")
+    print(f"🚀 moves/s: {result['moves_per_second']:,.0f}")
+    print(f"📊 games/s: {result['games_per_second']:,.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+비트보드 기반 테트리스 게임 시뮬레이션
+보드의 각 행을 정수 비트마스크로 저장하여 충돌 검사와 줄 삭제를
+비트 연산 몇 번으로 처리합니다. 규칙과 점수 계산은 클라이언트와 동일합니다.
+"""
+import random
+
+from app.engine.pieces import COLS, ROWS, PIECE_COUNT, ROTATIONS
+
+FULL_ROW = (1 << COLS) - 1
+
+# 입력 액션
+MOVE_LEFT = 0
+MOVE_RIGHT = 1
+MOVE_DOWN = 2  # 소프트 드롭 및 중력 낙하
+ROTATE = 3
+HARD_DROP = 4
+
+ACTIONS = (MOVE_LEFT, MOVE_RIGHT, MOVE_DOWN, ROTATE, HARD_DROP)
+
+# 줄 삭제 점수 (클라이언트 addScore와 동일, 4줄 이상은 800)
+LINE_SCORES = (0, 100, 300, 500, 800)
+
+UINT32 = 0xFFFFFFFF
+DEFAULT_SEED = 0x9E3779B9  # xorshift32는 상태 0에서 벗어나지 못하므로 대체 시드 사용
+
+
+class PieceRandom:
+    """피스 생성용 xorshift32 난수 (multi.html createPieceRandom과 같은 수열)
+
+    브라우저에서 CPython의 Mersenne Twister를 재현할 수 없으므로
+    양쪽에서 똑같이 구현할 수 있는 32비트 정수 연산만 사용합니다.
+    """
+
+    __slots__ = ('state',)
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.state = (int(seed) & UINT32) or DEFAULT_SEED
+
+    def next(self):
+        """다음 32비트 부호 없는 정수"""
+        x = self.state
+        x ^= (x << 13) & UINT32
+        x ^= x >> 17
+        x ^= (x << 5) & UINT32
+        self.state = x
+        return x
+
+    def randrange(self, n):
+        """0 이상 n 미만의 정수"""
+        return self.next() % n
+
+
+def line_score(lines, is_hard_drop=False):
+    """삭제한 줄 수에 대한 점수 (하드 드롭은 2배)"""
+    base = LINE_SCORES[min(lines, 4)]
+    return base * 2 if is_hard_drop else base
+
+
+class Board:
+    """행 단위 비트마스크 보드 (rows[0]이 맨 위)"""
+
+    __slots__ = ('rows',)
+
+    def __init__(self, rows=None):
+        self.rows = list(rows) if rows is not None else [0] * ROWS
+
+    def collides(self, state, x, y, strict=False):
+        """피스 상태를 (x, y)에 놓았을 때 충돌 여부"""
+        left = x + state.min_dx
+        if left < 0 or x + state.max_dx >= COLS:
+            return True
+
+        rows = self.rows
+        for dy, mask in state.rows:
+            row = y + dy
+            if row >= ROWS:
+                return True
+            if row < 0:
+                if strict:
+                    return True
+                continue
+            if rows[row] & (mask << left):
+                return True
+        return False
+
+    def place(self, state, x, y):
+        """피스 고정 (보드 위쪽으로 벗어난 칸은 무시)"""
+        left = x + state.min_dx
+        for dy, mask in state.rows:
+            row = y + dy
+            if row >= 0:
+                self.rows[row] |= mask << left
+
+    def clear_lines(self):
+        """가득 찬 줄 삭제 후 삭제한 줄 수 반환"""
+        remaining = [row for row in self.rows if row != FULL_ROW]
+        cleared = ROWS - len(remaining)
+        if cleared:
+            self.rows = [0] * cleared + remaining
+        return cleared
+
+    def to_grid(self):
+        """2차원 리스트 형태로 변환 (디버깅/표시용)"""
+        return [[(row >> x) & 1 for x in range(COLS)] for row in self.rows]
+
+
+class TetrisGame:
+    """한 판의 테트리스 게임 상태"""
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.rng = PieceRandom(seed)
+        self.board = Board()
+        self.score = 0
+        self.lines = 0
+        self.moves = 0
+        self.over = False
+        self.piece = 0
+        self.rotation = 0
+        self.x = 0
+        self.y = 0
+        self.spawn()
+
+    @property
+    def state(self):
+        """현재 피스의 회전 상태"""
+        rotations = ROTATIONS[self.piece]
+        return rotations[self.rotation % len(rotations)]
+
+    def next_piece(self):
+        """다음 피스 번호 (클라이언트와 같이 균등 분포)"""
+        return self.rng.randrange(PIECE_COUNT)
+
+    def spawn(self):
+        """새 피스 생성 (생성 위치가 막혀 있으면 게임 종료)"""
+        self.piece = self.next_piece()
+        self.rotation = 0
+        state = self.state
+        self.x = 4
+        self.y = -state.min_dy
+        if self.board.collides(state, self.x, self.y):
+            self.over = True
+
+    def lock(self, is_hard_drop=False):
+        """현재 피스 고정, 줄 삭제 및 점수 반영 후 다음 피스 생성"""
+        self.board.place(self.state, self.x, self.y)
+        cleared = self.board.clear_lines()
+        self.lines += cleared
+        self.score += line_score(cleared, is_hard_drop)
+        self.spawn()
+        return cleared
+
+    def move(self, dx, dy):
+        """이동 (아래로 막히면 고정)"""
+        if self.over:
+            return False
+        x, y = self.x + dx, self.y + dy
+        if not self.board.collides(self.state, x, y):
+            self.x, self.y = x, y
+            return True
+        if dy == 1:
+            self.lock()
+        return False
+
+    def rotate(self):
+        """회전 (회전 중심이 없는 피스는 무시)"""
+        if self.over:
+            return False
+        rotations = ROTATIONS[self.piece]
+        if len(rotations) == 1:
+            return False
+        rotation = (self.rotation + 1) % len(rotations)
+        if self.board.collides(rotations[rotation], self.x, self.y, strict=True):
+            return False
+        self.rotation = rotation
+        return True
+
+    def hard_drop(self):
+        """하드 드롭 (점수 2배)"""
+        if self.over:
+            return 0
+        state = self.state
+        while not self.board.collides(state, self.x, self.y + 1):
+            self.y += 1
+        return self.lock(is_hard_drop=True)
+
+    def apply(self, action):
+        """입력 액션 하나 적용"""
+        self.moves += 1
+        if action == MOVE_LEFT:
+            return self.move(-1, 0)
+        if action == MOVE_RIGHT:
+            return self.move(1, 0)
+        if action == MOVE_DOWN:
+            return self.move(0, 1)
+        if action == ROTATE:
+            return self.rotate()
+        if action == HARD_DROP:
+            return self.hard_drop()
+        raise ValueError(f"알 수 없는 액션입니다: {action}")
@@ -0,0 +1,62 @@
+"""
+테트로미노 정의 및 비트마스크 사전 계산
+블록 좌표와 회전 중심은 templates/solo.html, multi.html의 BLOCK_SHAPES와 동일합니다.
+"""
+
+# 게임 보드 크기 (클라이언트와 동일)
+COLS = 10
+ROWS = 15
+
+# (블록 좌표, 회전 중심) - 순서도 클라이언트와 동일 (I, J, L, O, S, T, Z)
+BLOCK_SHAPES = [
+    ([(-1, 0), (0, 0), (1, 0), (2, 0)], (0, 0)),
+    ([(-1, 0), (0, 0), (1, 0), (1, -1)], (0, 0)),
+    ([(-1, 0), (0, 0), (1, 0), (1, 1)], (0, 0)),
+    ([(0, 0), (1, 0), (0, 1), (1, 1)], None),
+    ([(-1, 0), (0, 0), (0, 1), (1, 1)], (0, 0)),
+    ([(-1, 0), (0, 0), (1, 0), (0, 1)], (0, 0)),
+    ([(-1, 1), (0, 1), (0, 0), (1, 0)], (0, 0)),
+]
+
+PIECE_COUNT = len(BLOCK_SHAPES)
+
+
+def rotate_blocks(blocks, center):
+    """회전 중심 기준 시계 방향 90도 회전 (클라이언트 rotate()와 동일)"""
+    cx, cy = center
+    return [(-(y - cy) + cx, (x - cx) + cy) for x, y in blocks]
+
+
+class PieceState:
+    """회전 상태 하나에 대한 비트마스크 표현"""
+
+    __slots__ = ('blocks', 'min_dx', 'max_dx', 'min_dy', 'rows')
+
+    def __init__(self, blocks):
+        self.blocks = tuple(blocks)
+        self.min_dx = min(dx for dx, _ in blocks)
+        self.max_dx = max(dx for dx, _ in blocks)
+        self.min_dy = min(dy for _, dy in blocks)
+
+        # dy -> min_dx 기준으로 정렬된 행 마스크
+        masks = {}
+        for dx, dy in blocks:
+            masks[dy] = masks.get(dy, 0) | (1 << (dx - self.min_dx))
+        self.rows = tuple(sorted(masks.items()))
+
+
+def _build_rotations(blocks, center):
+    """피스의 회전 상태 목록 (O 피스처럼 회전하지 않으면 1개)"""
+    states = [PieceState(blocks)]
+    if center is None:
+        return tuple(states)
+
+    current = blocks
+    for _ in range(3):
+        current = rotate_blocks(current, center)
+        states.append(PieceState(current))
+    return tuple(states)
+
+
+# 피스별 회전 상태 (인덱스: 피스 번호, 회전 횟수 % 상태 수)
+ROTATIONS = tuple(_build_rotations(blocks, center) for blocks, center in BLOCK_SHAPES)
@@ -0,0 +1,128 @@
+"""
+바이너리 리플레이 포맷
+피스 생성과 입력 이벤트를 varint + 프레임 델타로 인코딩하여
+60초 게임 한 판을 수 KB 이내로 저장합니다.
+
+포맷 (버전 1):
+    헤더    : b'JTR' + 버전(1바이트) + zigzag varint(seed)
+    이벤트  : varint((프레임 델타 << 4) | 코드) 반복
+              코드 0~4  -> 입력 액션 (app.engine.game의 액션 값)
+              코드 8~14 -> 피스 생성 (8 + 피스 번호)
+"""
+from app.engine.game import ACTIONS
+from app.engine.pieces import PIECE_COUNT
+
+MAGIC = b'JTR'
+VERSION = 1
+SPAWN_BASE = 8
+CODE_BITS = 4
+CODE_MASK = (1 << CODE_BITS) - 1
+
+
+def _zigzag(value):
+    return -value * 2 - 1 if value < 0 else value * 2
+
+
+def _unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def _write_varint(buffer, value):
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def spawn_code(piece):
+    """피스 생성 이벤트 코드"""
+    return SPAWN_BASE + piece
+
+
+def is_spawn(code):
+    """피스 생성 이벤트 여부"""
+    return SPAWN_BASE <= code < SPAWN_BASE + PIECE_COUNT
+
+
+def encode_replay(seed, events):
+    """(frame, code) 이벤트 목록을 바이너리로 인코딩"""
+    buffer = bytearray(MAGIC)
+    buffer.append(VERSION)
+    _write_varint(buffer, _zigzag(seed))
+
+    last_frame = 0
+    for frame, code in events:
+        if frame < last_frame:
+            raise ValueError("프레임은 증가하는 순서여야 합니다")
+        if code not in ACTIONS and not is_spawn(code):
+            raise ValueError(f"알 수 없는 이벤트 코드입니다: {code}")
+        _write_varint(buffer, ((frame - last_frame) << CODE_BITS) | code)
+        last_frame = frame
+    return bytes(buffer)
+
+
+def encode_input_log(input_log):
+    """입력 로그(dict)를 바이너리로 인코딩"""
+    return encode_replay(input_log['seed'], input_log['inputs'])
+
+
+def _iter_bytes(chunks):
+    """bytes 또는 bytes 청크 이터러블에서 한 바이트씩 순회"""
+    if isinstance(chunks, (bytes, bytearray, memoryview)):
+        chunks = (chunks,)
+    for chunk in chunks:
+        yield from bytes(chunk)
+
+
+def _read_varint(stream):
+    result = 0
+    shift = 0
+    for byte in stream:
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result
+        shift += 7
+    if shift:
+        raise ValueError("리플레이 데이터가 중간에 끝났습니다")
+    return None  # 정상 종료 (더 읽을 이벤트 없음)
+
+
+def decode_replay(chunks):
+    """리플레이를 스트리밍 디코딩하여 (seed, 이벤트 제너레이터) 반환
+
+    chunks는 bytes 또는 bytes 청크 이터러블이며, 이벤트는 필요할 때만 읽습니다.
+    """
+    stream = _iter_bytes(chunks)
+    header = bytearray()
+    for byte in stream:
+        header.append(byte)
+        if len(header) == len(MAGIC) + 1:
+            break
+    if len(header) != len(MAGIC) + 1 or header[:len(MAGIC)] != MAGIC:
+        raise ValueError("리플레이 형식이 아닙니다")
+    if header[-1] != VERSION:
+        raise ValueError(f"지원하지 않는 리플레이 버전입니다: {header[-1]}")
+
+    seed = _read_varint(stream)
+    if seed is None:
+        raise ValueError("리플레이 헤더가 올바르지 않습니다")
+
+    def events():
+        frame = 0
+        while True:
+            value = _read_varint(stream)
+            if value is None:
+                return
+            frame += value >> CODE_BITS
+            yield frame, value & CODE_MASK
+
+    return _unzigzag(seed), events()
+
+
+def to_input_log(chunks):
+    """리플레이를 검증용 입력 로그(dict)로 변환 (피스 생성 이벤트 제외)"""
+    seed, events = decode_replay(chunks)
+    return {
+        'seed': seed,
+        'inputs': [[frame, code] for frame, code in events if not is_spawn(code)]
+    }
@@ -0,0 +1,64 @@
+"""
+입력 로그 재시뮬레이션
+클라이언트가 보낸 입력 로그(피스 시드 + 프레임별 입력)를 엔진으로 다시 실행하여
+최종 점수를 계산합니다. 프로세스 풀 워커에서 실행되므로 Flask 객체에 의존하지 않습니다.
+
+입력 로그 형식:
+    {
+        'seed': 12345,                    # 피스 생성 시드
+        'inputs': [[frame, action], ...]  # frame: 게임 시작 후 프레임 (60fps), action: 0~4
+    }
+"""
+from app.engine.game import TetrisGame, ACTIONS
+
+FRAMES_PER_SECOND = 60
+GRAVITY_FRAMES = 60  # 1초마다 한 칸 낙하 (클라이언트 time.interval)
+MAX_INPUTS = 20000   # 60초 게임 기준으로 충분한 상한
+
+
+def validate_input_log(input_log):
+    """입력 로그 형식 검증 후 (seed, inputs) 반환"""
+    if not isinstance(input_log, dict):
+        raise ValueError("입력 로그 형식이 올바르지 않습니다")
+
+    seed = input_log.get('seed')
+    inputs = input_log.get('inputs')
+    if not isinstance(seed, int) or not isinstance(inputs, list):
+        raise ValueError("seed와 inputs가 필요합니다")
+    if len(inputs) > MAX_INPUTS:
+        raise ValueError("입력 수가 너무 많습니다")
+
+    last_frame = 0
+    for entry in inputs:
+        if not isinstance(entry, (list, tuple)) or len(entry) != 2:
+            raise ValueError("입력 항목 형식이 올바르지 않습니다")
+        frame, action = entry
+        if not isinstance(frame, int) or frame < last_frame:
+            raise ValueError("프레임은 증가하는 정수여야 합니다")
+        if action not in ACTIONS:
+            raise ValueError("알 수 없는 입력입니다")
+        last_frame = frame
+    return seed, inputs
+
+
+def simulate_input_log(input_log, game_time=60):
+    """입력 로그를 재생하여 최종 점수 반환"""
+    seed, inputs = validate_input_log(input_log)
+    end_frame = game_time * FRAMES_PER_SECOND
+
+    game = TetrisGame(seed=seed)
+    next_gravity = GRAVITY_FRAMES
+    for frame, action in inputs:
+        if frame >= end_frame or game.over:
+            break
+        # 입력 시점까지의 중력 낙하 먼저 적용
+        while next_gravity <= frame and not game.over:
+            game.move(0, 1)
+            next_gravity += GRAVITY_FRAMES
+        game.apply(action)
+
+    # 마지막 입력 이후 남은 시간 동안의 중력 낙하
+    while next_gravity < end_frame and not game.over:
+        game.move(0, 1)
+        next_gravity += GRAVITY_FRAMES
+    return game.score
@@ -1,12 +1,14 @@
 from datetime import datetime
 from app.utils.database import get_db
+from app.models.game_replay import GameReplay
+from app.utils.record_ingest import record_ingest
 
 
 class GameRecord:
     """게임 기록 모델"""
     
     def __init__(self, game_id=None, room_id=None, game_type='solo', players=None, 
-                 winner_id=None, duration=None, created_at=None):
+                 winner_id=None, duration=None, created_at=None, replays=None):
         self.game_id = game_id
         self.room_id = room_id
         self.game_type = game_type  # 'solo' or 'multiplayer'
@@ -14,6 +16,7 @@ class GameRecord:
         self.winner_id = winner_id
         self.duration = duration  # 게임 지속 시간 (초)
         self.created_at = created_at or datetime.utcnow()
+        self.replays = replays or []  # 리플레이 메타데이터 [{'user_id': str, 'size': int, 'chunks': int}]
 
     def to_dict(self):
         """사전 형태로 변환"""
@@ -24,7 +27,8 @@ class GameRecord:
             'players': self.players,
             'winner_id': self.winner_id,
             'duration': self.duration,
-            'created_at': self.created_at
+            'created_at': self.created_at,
+            'replays': self.replays
         }
 
     def to_mongodb_doc(self):
@@ -37,7 +41,8 @@ class GameRecord:
             'players': self.players,
             'winner_id': self.winner_id,
             'duration': self.duration,
-            'created_at': self.created_at
+            'created_at': self.created_at,
+            'replays': self.replays
         }
 
     @staticmethod
@@ -53,14 +58,12 @@ class GameRecord:
             players=doc.get('players', []),
             winner_id=doc.get('winner_id'),
             duration=doc.get('duration'),
-            created_at=doc.get('created_at')
+            created_at=doc.get('created_at'),
+            replays=doc.get('replays', [])
         )
 
-    def save(self):
-        """게임 기록 저장"""
-        db = get_db()
-        
-        # game_id가 없으면 자동 생성
+    def ensure_game_id(self):
+        """game_id가 없으면 자동 생성"""
         if not self.game_id:
             try:
                 from bson import ObjectId
@@ -68,6 +71,24 @@ class GameRecord:
             except ImportError:
                 import uuid
                 self.game_id = str(uuid.uuid4())
+        return self.game_id
+
+    def attach_replay(self, user_id, data):
+        """플레이어 리플레이 바이너리를 별도 컬렉션에 저장하고 메타데이터 기록"""
+        self.ensure_game_id()
+        self.replays.append(GameReplay.save(self.game_id, user_id, data))
+
+    def iter_replay(self, user_id):
+        """플레이어 리플레이를 스트리밍 디코딩하여 (seed, 이벤트 제너레이터) 반환"""
+        from app.engine.replay import decode_replay
+        return decode_replay(GameReplay.iter_chunks(self.game_id, user_id))
+
+    def save(self):
+        """게임 기록 저장"""
+        db = get_db()
+        
+        # game_id가 없으면 자동 생성
+        self.ensure_game_id()
         
         doc = self.to_mongodb_doc()
         result = db.game_records.update_one(
@@ -77,21 +98,33 @@ class GameRecord:
         )
         return result
 
+    def attach_replays(self, replays):
+        """아직 저장하지 않은 플레이어 리플레이만 저장 (재시도 시 같은 게임에 중복 저장 방지)"""
+        saved = {replay['user_id'] for replay in self.replays}
+        for user_id, data in (replays or {}).items():
+            if user_id not in saved:
+                self.attach_replay(user_id, data)
+
+    def submit(self, replays=None):
+        """리플레이 저장 후 일괄 저장 대기열에 추가 (같은 기록으로 다시 호출해도 한 번만 저장)"""
+        self.attach_replays(replays)
+        record_ingest.submit(self)
+        return self
+
     @staticmethod
-    def create_solo_record(user_id, user_name, score, duration):
-        """솔로 게임 기록 생성"""
+    def create_solo_record(user_id, user_name, score, duration, replay=None):
+        """솔로 게임 기록 생성 후 일괄 저장 대기열에 추가 (replay: 리플레이 바이너리)"""
         record = GameRecord(
             game_type='solo',
             players=[{'user_id': user_id, 'name': user_name, 'score': score}],
             winner_id=user_id,
             duration=duration
         )
-        record.save()
-        return record
+        return record.submit({user_id: replay} if replay else None)
 
     @staticmethod
-    def create_multiplayer_record(room_id, players_data, scores, winner_id, duration):
-        """멀티플레이어 게임 기록 생성"""
+    def new_multiplayer_record(room_id, players_data, winner_id, duration):
+        """멀티플레이어 게임 기록 객체 생성 (저장하지 않음, game_id 확정)"""
         record = GameRecord(
             room_id=room_id,
             game_type='multiplayer',
@@ -99,5 +132,11 @@ class GameRecord:
             winner_id=winner_id,
             duration=duration
         )
-        record.save()
+        record.ensure_game_id()
         return record
+
+    @staticmethod
+    def create_multiplayer_record(room_id, players_data, scores, winner_id, duration, replays=None):
+        """멀티플레이어 게임 기록 생성 후 일괄 저장 대기열에 추가 (replays: {user_id: 리플레이 바이너리})"""
+        record = GameRecord.new_multiplayer_record(room_id, players_data, winner_id, duration)
+        return record.submit(replays)
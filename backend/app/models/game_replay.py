@@ -0,0 +1,56 @@
+from bson import Binary
+from pymongo.errors import BulkWriteError
+from app.utils.database import get_db
+
+DUPLICATE_KEY = 11000
+
+
+class GameReplay:
+    """게임 리플레이 저장소 (game_replays 컬렉션에 청크 단위로 저장)
+
+    game_records 문서에는 리플레이 메타데이터만 두고 바이너리는 별도 컬렉션에 저장하여
+    기록 목록 조회 시 리플레이가 함께 로드되지 않도록 합니다.
+    """
+
+    CHUNK_SIZE = 64 * 1024  # 청크당 최대 크기 (바이트)
+
+    @staticmethod
+    def save(game_id, user_id, data):
+        """리플레이 바이너리를 청크로 나누어 저장 후 메타데이터 반환"""
+        db = get_db()
+        chunk_size = GameReplay.CHUNK_SIZE
+        docs = [
+            {
+                '_id': f"{game_id}:{user_id}:{n}",
+                'game_id': game_id,
+                'user_id': user_id,
+                'n': n,
+                'data': Binary(data[offset:offset + chunk_size])
+            }
+            for n, offset in enumerate(range(0, len(data), chunk_size))
+        ]
+        if docs:
+            try:
+                db.game_replays.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                # 청크 _id가 고정이므로 재시도로 이미 저장된 청크(중복 키)는 성공으로 간주
+                if any(error.get('code') != DUPLICATE_KEY for error in e.details.get('writeErrors', [])):
+                    raise
+        return {'user_id': user_id, 'size': len(data), 'chunks': len(docs)}
+
+    @staticmethod
+    def iter_chunks(game_id, user_id):
+        """리플레이 청크를 순서대로 하나씩 반환 (스트리밍 디코딩용)"""
+        db = get_db()
+        cursor = db.game_replays.find(
+            {'game_id': game_id, 'user_id': user_id},
+            {'data': 1}
+        ).sort('n', 1)
+        for doc in cursor:
+            yield bytes(doc['data'])
+
+    @staticmethod
+    def delete(game_id):
+        """게임의 모든 리플레이 삭제"""
+        db = get_db()
+        return db.game_replays.delete_many({'game_id': game_id})
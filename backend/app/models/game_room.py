@@ -1,5 +1,7 @@
 from datetime import datetime
+from pymongo import UpdateOne, ReturnDocument
 from app.utils.database import get_db
+import secrets
 import uuid
 
 
@@ -7,13 +9,15 @@ class GameRoom:
     """게임 방 모델"""
     
     def __init__(self, room_id=None, host_user_id=None, host_name=None, status='waiting', 
-                 participants=None, created_at=None):
+                 participants=None, created_at=None, seed=None):
         self.room_id = room_id or str(uuid.uuid4())[:8]
         self.host_user_id = host_user_id
         self.host_name = host_name
         self.status = status  # 'waiting', 'playing', 'finished'
         self.participants = participants or []
         self.created_at = created_at or datetime.utcnow()
+        self.seed = seed  # 게임 시작 시 서버가 발급하는 피스 시드 (리플레이 검증용)
+        self.replays = {}  # 메모리 전용 (DB 저장 안 함): user_id -> 리플레이 바이너리
 
     def to_dict(self):
         """사전 형태로 변환"""
@@ -37,7 +41,8 @@ class GameRoom:
             'host_name': self.host_name,
             'status': self.status,
             'participants': self.participants,
-            'created_at': self.created_at
+            'created_at': self.created_at,
+            'seed': self.seed
         }
 
     @staticmethod
@@ -52,7 +57,8 @@ class GameRoom:
             host_name=doc.get('host_name'),
             status=doc.get('status', 'waiting'),
             participants=doc.get('participants', []),
-            created_at=doc.get('created_at')
+            created_at=doc.get('created_at'),
+            seed=doc.get('seed')
         )
 
     @staticmethod
@@ -98,6 +104,45 @@ class GameRoom:
         self.save()
         return True, "방에 참가했습니다"
 
+    @staticmethod
+    def join(room_id, user_id, user_name, max_players=2):
+        """조건부 방 참가 (대기 중, 정원 미만, 미참가 조건을 한 번의 갱신으로 확인)
+
+        성공 시 (갱신된 방, None), 실패 시 (방 또는 None, 오류 메시지) 반환
+        """
+        db = get_db()
+        participant = {
+            'user_id': user_id,
+            'name': user_name,
+            'joined_at': datetime.utcnow(),
+            'score': 0,
+            'status': 'ready'
+        }
+        doc = db.game_rooms.find_one_and_update(
+            {
+                'room_id': room_id,
+                'status': 'waiting',
+                f'participants.{max_players - 1}': {'$exists': False},
+                'participants.user_id': {'$ne': user_id}
+            },
+            {'$push': {'participants': participant}},
+            return_document=ReturnDocument.AFTER
+        )
+        if doc:
+            return GameRoom.from_mongodb_doc(doc), None
+        
+        # 실패한 경우에만 원인 확인을 위해 다시 조회
+        room = GameRoom.find_by_room_id(room_id)
+        if not room:
+            return None, "존재하지 않는 방입니다"
+        if room.status == 'playing':
+            return room, "게임이 진행 중인 방입니다"
+        if any(p['user_id'] == user_id for p in room.participants):
+            return room, "이미 참가한 사용자입니다"
+        if len(room.participants) >= max_players:
+            return room, "방이 가득 찼습니다"
+        return room, "참가할 수 없는 방입니다"
+
     def start_game(self):
         """게임 시작"""
         if len(self.participants) != 2:
@@ -107,9 +152,23 @@ class GameRoom:
             return False, "게임을 시작할 수 없는 상태입니다"
         
         self.status = 'playing'
+        self.seed = GameRoom.claim_seed(self.room_id, secrets.randbits(32))
         self.save()
         return True, "게임이 시작되었습니다"
 
+    @staticmethod
+    def claim_seed(room_id, seed):
+        """방의 피스 시드를 한 번만 발급 (두 워커가 동시에 시작해도 먼저 저장된 시드 사용)"""
+        db = get_db()
+        doc = db.game_rooms.find_one_and_update(
+            {'room_id': room_id, 'seed': None},
+            {'$set': {'seed': seed}},
+            return_document=ReturnDocument.AFTER
+        )
+        if doc is None:
+            doc = db.game_rooms.find_one({'room_id': room_id}, {'seed': 1})
+        return doc.get('seed', seed) if doc else seed
+
     def end_game(self, scores=None):
         """게임 종료"""
         self.status = 'finished'
@@ -122,15 +181,63 @@ class GameRoom:
         self.save()
         return True, "게임이 종료되었습니다"
 
-    def update_participant_score(self, user_id, score):
-        """참가자 점수 업데이트"""
+    def update_participant_score(self, user_id, score, persist=True):
+        """참가자 점수 업데이트 (persist=False면 메모리에만 반영)"""
         for participant in self.participants:
             if participant['user_id'] == user_id:
                 participant['score'] = score
-                self.save()
+                if persist:
+                    self.save()
                 return True
         return False
 
+    @staticmethod
+    def finish_participant(room_id, user_id, score):
+        """참가자의 최종 점수와 완료 상태를 원자적으로 저장 후 (방, 갱신 여부) 반환
+
+        진행 중인 방에서 아직 끝내지 않은 참가자만 갱신하므로, 같은 game:end가
+        반복되어도 한 번만 반영됩니다. 갱신되지 않으면 현재 방(없으면 None)과 False 반환
+        """
+        db = get_db()
+        doc = db.game_rooms.find_one_and_update(
+            {
+                'room_id': room_id,
+                'status': 'playing',
+                'participants': {'$elemMatch': {'user_id': user_id, 'finished': {'$ne': True}}}
+            },
+            {'$set': {
+                'participants.$.score': score,
+                'participants.$.finished': True
+            }},
+            return_document=ReturnDocument.AFTER
+        )
+        if doc:
+            return GameRoom.from_mongodb_doc(doc), True
+        return GameRoom.find_by_room_id(room_id), False
+
+    @staticmethod
+    def bulk_update_scores(scores):
+        """여러 방의 참가자 점수를 한 번에 저장 (scores: [(room_id, user_id, score)])
+
+        게임을 마친 참가자는 건너뛰어, 진행 중이던 write-behind 저장이
+        finish_participant가 기록한 최종 점수를 덮어쓰지 않도록 합니다.
+        """
+        if not scores:
+            return None
+        db = get_db()
+        operations = [
+            UpdateOne(
+                {'room_id': room_id, 'participants': {'$elemMatch': {'user_id': user_id, 'finished': {'$ne': True}}}},
+                {'$set': {'participants.$.score': score}}
+            )
+            for room_id, user_id, score in scores
+        ]
+        return db.game_rooms.bulk_write(operations, ordered=False)
+
+    def has_participant(self, user_id):
+        """참가자 여부 확인"""
+        return any(p['user_id'] == user_id for p in self.participants)
+
     def is_host(self, user_id):
         """방장 여부 확인"""
         return self.host_user_id == user_id
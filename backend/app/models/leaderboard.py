@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.config import Config
+from app.utils.database import get_db
+
+
+class PeriodLeaderboard:
+    """기간별(일간/주간/시즌) 리더보드 모델
+
+    게임 기록 저장 시점에 leaderboard_buckets 컬렉션의 (기간, 사용자) 문서를
+    $max/$inc로 갱신해 두고, 조회는 (window, period) 인덱스 범위만 읽습니다.
+    """
+
+    WINDOWS = ('daily', 'weekly', 'season')
+
+    # 게임 종류별 최고 점수 필드 (솔로와 대전 점수는 따로 순위를 매김)
+    SCORE_FIELDS = {
+        'solo': 'best_score',
+        'multiplayer': 'multi_best_score'
+    }
+
+    # 기간이 지난 버킷 보관 기간 (TTL 인덱스로 자동 삭제, 시즌은 영구 보관)
+    RETENTION = {
+        'daily': timedelta(days=40),
+        'weekly': timedelta(weeks=20),
+        'season': None
+    }
+
+    # 버킷마다 최근 반영한 game_id 보관 수 (재시도 시 같은 게임 중복 반영 방지)
+    APPLIED_GAMES_KEPT = 50
+    DUPLICATE_KEY = 11000
+
+    @staticmethod
+    def period_key(window, at=None):
+        """시각이 속한 기간 키 (예: '2025-07-14', '2025-W29', 'S3')"""
+        at = at or datetime.utcnow()
+        if window == 'daily':
+            return at.strftime('%Y-%m-%d')
+        if window == 'weekly':
+            year, week, _ = at.isocalendar()
+            return f"{year}-W{week:02d}"
+        if window == 'season':
+            epoch = datetime.strptime(Config.SEASON_EPOCH, '%Y-%m-%d')
+            return f"S{max((at - epoch).days, 0) // Config.SEASON_LENGTH_DAYS + 1}"
+        raise ValueError(f"지원하지 않는 기간입니다: {window}")
+
+    @staticmethod
+    def _operations(user_id, name, score, win, at, game_id, mode='solo'):
+        """사용자 한 명의 기간별 버킷 갱신 연산 (mode: 'solo' 또는 'multiplayer')
+
+        이미 game_id를 반영한 버킷은 필터에 걸리지 않고, upsert가 같은 _id로
+        삽입을 시도하다 중복 키 오류가 나므로 같은 게임은 한 번만 반영됩니다.
+        """
+        score_field = PeriodLeaderboard.SCORE_FIELDS[mode]
+        operations = []
+        for window in PeriodLeaderboard.WINDOWS:
+            period = PeriodLeaderboard.period_key(window, at)
+            update = {
+                '$max': {score_field: score},
+                '$inc': {'games': 1, 'wins': 1 if win else 0},
+                '$set': {'name': name, 'updated_at': at},
+                '$push': {'applied_games': {'$each': [game_id], '$slice': -PeriodLeaderboard.APPLIED_GAMES_KEPT}},
+                '$setOnInsert': {'window': window, 'period': period, 'user_id': user_id}
+            }
+            retention = PeriodLeaderboard.RETENTION[window]
+            if retention:
+                update['$setOnInsert']['expires_at'] = at + retention
+            operations.append(UpdateOne(
+                {'_id': f"{window}:{period}:{user_id}", 'applied_games': {'$ne': game_id}},
+                update,
+                upsert=True
+            ))
+        return operations
+
+    @staticmethod
+    def _game_operations(record):
+        """게임 기록 하나의 참가자별 버킷 갱신 연산"""
+        players = record.players or []
+        if not players:
+            return []
+
+        # 최고 점수가 동점이면 무승부로 보고 승리를 올리지 않음
+        top_score = max(p.get('score', 0) for p in players)
+        is_draw = sum(1 for p in players if p.get('score', 0) == top_score) > 1
+
+        operations = []
+        for player in players:
+            win = (
+                record.game_type == 'multiplayer'
+                and not is_draw
+                and player['user_id'] == record.winner_id
+            )
+            operations.extend(PeriodLeaderboard._operations(
+                player['user_id'], player.get('name'), player.get('score', 0), win, record.created_at,
+                record.ensure_game_id(), 'multiplayer' if record.game_type == 'multiplayer' else 'solo'
+            ))
+        return operations
+
+    @staticmethod
+    def record_game(record):
+        """게임 기록 하나를 모든 기간 버킷에 반영 (bulk_write 한 번)"""
+        return PeriodLeaderboard.record_games([record])
+
+    @staticmethod
+    def record_games(records):
+        """여러 게임 기록을 모든 기간 버킷에 반영 (bulk_write 한 번, 이미 반영한 게임은 건너뜀)"""
+        operations = []
+        for record in records:
+            operations.extend(PeriodLeaderboard._game_operations(record))
+        if not operations:
+            return None
+
+        db = get_db()
+        try:
+            return db.leaderboard_buckets.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            duplicates = PeriodLeaderboard._duplicate_indexes(e)
+
+        # 중복 키는 이미 반영한 게임이거나, 다른 게임이 같은 버킷을 동시에 처음 만들어
+        # upsert 경합에서 진 경우입니다. 버킷이 생긴 뒤 한 번 더 실행하면 반영하지 않은
+        # 게임은 $ne 필터에 걸려 갱신되고, 이미 반영한 게임만 다시 중복 키로 끝납니다.
+        retry = [operations[index] for index in duplicates]
+        try:
+            db.leaderboard_buckets.bulk_write(retry, ordered=False)
+        except BulkWriteError as e:
+            PeriodLeaderboard._duplicate_indexes(e)
+        return None
+
+    @staticmethod
+    def _duplicate_indexes(error):
+        """일괄 쓰기 오류 중 중복 키 연산 위치 (다른 오류가 있으면 다시 발생)"""
+        errors = error.details.get('writeErrors', [])
+        if any(item.get('code') != PeriodLeaderboard.DUPLICATE_KEY for item in errors):
+            raise error
+        return [item['index'] for item in errors]
+
+    @staticmethod
+    def top(window, board='score', limit=100, period=None, mode='solo'):
+        """기간별 상위 목록 (board: 'score' 또는 'wins', mode: 점수 순위의 게임 종류)"""
+        if window not in PeriodLeaderboard.WINDOWS:
+            raise ValueError(f"지원하지 않는 기간입니다: {window}")
+        if mode not in PeriodLeaderboard.SCORE_FIELDS:
+            raise ValueError(f"지원하지 않는 게임 종류입니다: {mode}")
+        score_field = PeriodLeaderboard.SCORE_FIELDS[mode]
+        field = score_field if board == 'score' else 'wins'
+        period = period or PeriodLeaderboard.period_key(window)
+
+        db = get_db()
+        cursor = db.leaderboard_buckets.find(
+            {'window': window, 'period': period, field: {'$gt': 0}},
+            {'user_id': 1, 'name': 1, score_field: 1, 'wins': 1, 'games': 1}
+        ).sort([(field, -1), ('updated_at', 1)]).limit(limit)
+
+        rankings = []
+        for i, doc in enumerate(cursor, 1):
+            rankings.append({
+                'rank': i,
+                'user_id': doc.get('user_id'),
+                'name': doc.get('name'),
+                'score': doc.get(score_field, 0),
+                'wins': doc.get('wins', 0),
+                'games': doc.get('games', 0)
+            })
+        return period, rankings
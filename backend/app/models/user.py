@@ -1,17 +1,12 @@
 from datetime import datetime
-try:
-    from werkzeug.security import generate_password_hash, check_password_hash
-except ImportError:
-    # 대체 구현
-    import hashlib
-    
-    def generate_password_hash(password):
-        return hashlib.sha256(password.encode()).hexdigest()
-    
-    def check_password_hash(hashed, password):
-        return hashed == hashlib.sha256(password.encode()).hexdigest()
-
+from pymongo import UpdateOne, ReturnDocument
 from app.utils.database import get_db
+from app.utils.ranking_cache import ranking_cache
+from app.utils.rank_index import user_rank_index
+from app.utils.password_hasher import password_hasher
+
+# 통계 갱신 후 다시 읽는 필드 (비밀번호 해시, 토큰 정보 제외)
+STATS_FIELDS = {'_id': 0, 'user_id': 1, 'name': 1, 'wins': 1, 'solo_high_score': 1, 'created_at': 1}
 
 
 class User:
@@ -22,7 +17,7 @@ class User:
                  refresh_token_version=0, refresh_token_issued_at=None, last_login=None, is_active=True):
         self.user_id = user_id
         self.name = name
-        self.hashed_password = hashed_password or (generate_password_hash(password) if password else None)
+        self.hashed_password = hashed_password or (password_hasher.hash(password) if password else None)
         self.created_at = created_at or datetime.utcnow()
         self.last_login = last_login
         self.is_active = is_active
@@ -32,8 +27,20 @@ class User:
         self.refresh_token_issued_at = refresh_token_issued_at or datetime.utcnow()
 
     def check_password(self, password):
-        """비밀번호 확인"""
-        return check_password_hash(self.hashed_password, password)
+        """비밀번호 확인 (이벤트 루프 밖에서 검증)"""
+        return password_hasher.verify(self.hashed_password, password)
+
+    def rehash_password_if_needed(self, password):
+        """기존 방식이거나 라운드 수가 바뀐 해시를 현재 설정으로 다시 저장 (로그인 성공 후 호출)"""
+        if not password_hasher.needs_rehash(self.hashed_password):
+            return False
+        self.hashed_password = password_hasher.hash(password)
+        db = get_db()
+        db.users.update_one(
+            {'user_id': self.user_id},
+            {'$set': {'password_hash': self.hashed_password}}
+        )
+        return True
 
     def to_dict(self, include_stats=True):
         """사전 형태로 변환"""
@@ -111,19 +118,65 @@ class User:
         return result
 
     def update_stats(self, score_gained=0, game_result=None, solo_score=None):
-        """게임 통계 업데이트"""
-        if game_result == 'win':
-            self.wins += 1
+        """게임 통계 업데이트 ($inc/$max 원자적 갱신)"""
+        # 멀티플레이어 점수도 최고 점수 갱신에 반영
+        score = max(solo_score or 0, score_gained or 0)
         
-        # 솔로 점수 업데이트
-        if solo_score and solo_score > self.solo_high_score:
-            self.solo_high_score = solo_score
+        db = get_db()
+        doc = db.users.find_one_and_update(
+            {'user_id': self.user_id},
+            User.stats_update(game_result == 'win', score),
+            projection=STATS_FIELDS,
+            return_document=ReturnDocument.AFTER
+        )
+        if doc:
+            self.wins = doc.get('wins', 0)
+            self.solo_high_score = doc.get('solo_high_score', 0)
+        User._notify_rankings(self)
+
+    @staticmethod
+    def stats_update(win=False, score=0):
+        """통계 변경 업데이트 문서 (승리 $inc, 최고 점수 $max)"""
+        update = {'$max': {'solo_high_score': score or 0}}
+        if win:
+            update['$inc'] = {'wins': 1}
+        return update
+
+    @staticmethod
+    def bulk_update_stats(results):
+        """경기 결과 통계를 bulk_write 한 번으로 반영 (results: [(user_id, win, score)])
+
+        랭킹 반영은 refresh_rankings로 따로 호출하여, 그쪽이 실패해 재시도해도
+        승리 $inc가 다시 실행되지 않도록 합니다.
+        """
+        if not results:
+            return None
         
-        # 멀티플레이어 점수도 최고 점수 갱신에 반영
-        if score_gained > 0 and score_gained > self.solo_high_score:
-            self.solo_high_score = score_gained
+        db = get_db()
+        return db.users.bulk_write([
+            UpdateOne({'user_id': user_id}, User.stats_update(win, score))
+            for user_id, win, score in results
+        ], ordered=False)
+
+    @staticmethod
+    def refresh_rankings(user_ids):
+        """갱신된 통계를 한 번에 다시 읽어 랭킹 캐시/순위 인덱스에 반영"""
+        if not user_ids:
+            return []
         
-        self.save()
+        db = get_db()
+        users = [
+            User.from_mongodb_doc(doc)
+            for doc in db.users.find({'user_id': {'$in': list(user_ids)}}, STATS_FIELDS)
+        ]
+        for user in users:
+            User._notify_rankings(user)
+        return users
+
+    @staticmethod
+    def _notify_rankings(user):
+        ranking_cache.on_user_updated(user)
+        user_rank_index.on_user_updated(user)
 
     def increment_refresh_token_version(self):
         """리프레시 토큰 버전 증가 (로그아웃 처리)"""
@@ -3,7 +3,16 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_tok
 from app.models.user import User
 from app.models.game_room import GameRoom
 from app.models.game_record import GameRecord
+from app.models.leaderboard import PeriodLeaderboard
 from app.routes.auth import validate_user_id, validate_name, validate_password
+from app.utils.replay_verifier import replay_verifier, VERIFIED
+from app.engine.replay import encode_input_log
+from app.utils.ranking_cache import ranking_cache
+from app.utils.rank_index import user_rank_index
+from app.utils.room_registry import room_registry
+from app.utils.password_hasher import PasswordHasherBusy
+from app.utils.record_ingest import RecordQueueFull
+from app.utils.profiler import sampling_profiler, ProfilerBusy
 
 main_bp = Blueprint('main', __name__)
 
@@ -40,6 +49,7 @@ def login():
         if not user.check_password(password):
             flash('아이디 또는 비밀번호가 올바르지 않습니다', 'error')
             return redirect(url_for('main.login'))
+        user.rehash_password_if_needed(password)
         
         # JWT 토큰 생성
         access_token = create_access_token(identity=user_id)
@@ -53,6 +63,9 @@ def login():
         # 성공 시
         return response
             
+    except PasswordHasherBusy:
+        flash('로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.', 'error')
+        return redirect(url_for('main.login'))
     except Exception as e:
         flash('로그인 처리 중 오류가 발생했습니다.', 'error')
         return redirect(url_for('main.login'))
@@ -99,6 +112,7 @@ def register():
         # 새 사용자 생성
         user = User(user_id=user_id, name=name, password=password)
         user.save()
+        user_rank_index.on_user_updated(user)
 
         # JWT 토큰 생성 (회원가입 시 자동 로그인)
         access_token = create_access_token(identity=user_id)
@@ -112,6 +126,9 @@ def register():
         # 성공 시
         return response
 
+    except PasswordHasherBusy:
+        flash('회원가입 요청이 많습니다. 잠시 후 다시 시도해주세요.', 'error')
+        return render_template('register.html')
     except Exception as e:
         flash('회원가입 처리 중 오류가 발생했습니다.', 'error')
         return render_template('register.html')
@@ -174,6 +191,23 @@ def multi():
 def multi_html_redirect():
     return redirect(url_for('main.multi'))
 
+@main_bp.route('/spectate')
+@jwt_required()
+def spectate():
+    """관전 (JWT 인증) : 진행 중인 대전의 점수와 보드를 읽기 전용으로 표시"""
+    user_id = get_jwt_identity()
+    user = User.find_by_user_id(user_id)
+    
+    if not user:
+        flash('사용자를 찾을 수 없습니다.', 'error')
+        return redirect(url_for('main.login'))
+    
+    return render_template('spectate.html', user_name=user.name, socket_url=current_app.config['SOCKET_URL'])
+
+@main_bp.route('/spectate.html')
+def spectate_html_redirect():
+    return redirect(url_for('main.spectate'))
+
 @main_bp.route('/ranking')
 @jwt_required()
 def ranking():
@@ -185,41 +219,28 @@ def ranking():
         flash('사용자를 찾을 수 없습니다.', 'error')
         return redirect(url_for('main.login'))
     
-    # 실제 데이터베이스에서 랭킹 데이터 조회
-    from app.utils.database import get_db
-    db = get_db()
-
-    # 승리 랭킹 (최대 15명)
-    win_pipeline = [
-        {'$match': {'wins': {'$gt': 0}}},
-        {'$sort': {'wins': -1, 'created_at': 1}},
-        {'$limit': 15},
-        {'$project': {'name': 1, 'wins': 1}}
+    # 랭킹 캐시에서 상위 15명 조회
+    win_ranking = [
+        {'name': entry['name'], 'wins': entry['wins']}
+        for entry in ranking_cache.top_wins(15)
     ]
-    win_ranking = list(db.users.aggregate(win_pipeline))
-
-    # 점수 랭킹 (최대 15명)
-    score_pipeline = [
-        {'$match': {'solo_high_score': {'$gt': 0}}},
-        {'$sort': {'solo_high_score': -1, 'created_at': 1}},
-        {'$limit': 15},
-        {'$project': {'name': 1, 'score': '$solo_high_score'}}
+    score_ranking = [
+        {'name': entry['name'], 'score': entry['solo_high_score']}
+        for entry in ranking_cache.top_scores(15)
     ]
-    # $project에서 필드명 변경이 필요하므로, post-process
-    score_ranking = []
-    for doc in db.users.aggregate(score_pipeline):
-        score_ranking.append({'name': doc.get('name'), 'score': doc.get('score', doc.get('solo_high_score', 0))})
 
     # 현재 사용자 정보
     current_user = {'name': user.name}
     current_user_wins = user.wins  # 실제 사용자의 승리 횟수
     current_user_score = user.solo_high_score  # 실제 사용자의 최고 점수
+    current_user_rank = user_rank_index.lookup(user)  # 순위 및 백분위
     return render_template('ranking.html', 
                          win_ranking=win_ranking,
                          score_ranking=score_ranking,
                          current_user=current_user,
                          current_user_wins=current_user_wins,
                          current_user_score=current_user_score,
+                         current_user_rank=current_user_rank,
                          user_name=user.name)
 
 @main_bp.route('/ranking.html')
@@ -314,27 +335,18 @@ def api_join_room():
         if not user:
             return jsonify({'error': '사용자를 찾을 수 없습니다'}), 404
         
-        # 방 조회
-        room = GameRoom.find_by_room_id(room_id)
+        # 조건부 참가 (대기 중, 정원 미만, 미참가일 때만 한 번의 갱신으로 추가)
+        room, error = GameRoom.join(room_id, user_id, user.name, current_app.config['MAX_ROOM_PLAYERS'])
         if not room:
-            return jsonify({'error': '존재하지 않는 방입니다'}), 404
-        
-        # 방 참가 가능 여부 확인
-        if not room.can_join():
-            if room.status == 'playing':
-                return jsonify({'error': '게임이 진행 중인 방입니다'}), 400
-            elif len(room.participants) >= 2:
-                return jsonify({'error': '방이 가득 찼습니다'}), 400
-            else:
-                return jsonify({'error': '참가할 수 없는 방입니다'}), 400
-        
-        # 방에 참가
-        success, message = room.add_participant(user_id, user.name)
-        if not success:
-            return jsonify({'error': message}), 400
+            return jsonify({'error': error}), 404
+        if error:
+            return jsonify({'error': error}), 400
+        
+        # 이어지는 소켓 room:join에서 방을 다시 조회하지 않도록 보관
+        room_registry.stage(room)
         
         return jsonify({
-            'message': message,
+            'message': "방에 참가했습니다",
             'room_id': room_id,
             'players': [p['name'] for p in room.participants],
             'game_started': len(room.participants) == 2
@@ -381,11 +393,19 @@ def api_end_solo_game():
         if not user:
             return jsonify({'error': '사용자를 찾을 수 없습니다'}), 404
         
+        # 입력 로그 재시뮬레이션으로 점수 검증
+        input_log = data.get('replay')
+        accepted, verify_result = replay_verifier.verify(input_log, score)
+        if not accepted:
+            return jsonify({'error': '점수 검증에 실패했습니다'}), 400
+        
         # 개인 최고 점수 확인
         personal_best = score > user.solo_high_score
         
         # 게임 기록 저장
-        GameRecord.create_solo_record(user_id, user.name, score, 60)
+        # 검증된 입력 로그만 리플레이로 저장
+        replay = encode_input_log(input_log) if verify_result == VERIFIED else None
+        GameRecord.create_solo_record(user_id, user.name, score, 60, replay=replay)
         
         # 사용자 통계 업데이트
         user.update_stats(solo_score=score)
@@ -396,6 +416,8 @@ def api_end_solo_game():
             'is_best': personal_best
         }), 200
         
+    except RecordQueueFull:
+        return jsonify({'error': '게임 기록 저장 요청이 많습니다. 잠시 후 다시 시도해주세요'}), 503
     except Exception as e:
         current_app.logger.error(f"End solo game error: {str(e)}")
         return jsonify({'error': '솔로 게임 종료 중 오류가 발생했습니다'}), 500
@@ -406,32 +428,17 @@ def api_get_score_ranking():
     """점수 랭킹 조회 API"""
     try:
         limit = request.args.get('limit', 100, type=int)
-        limit = min(limit, 100)  # 최대 100개까지만 조회
-        
-        from app.utils.database import get_db
-        db = get_db()
-        
-        # 최고 점수 기준 랭킹 (솔로 게임)
-        pipeline = [
-            {'$match': {'solo_high_score': {'$gt': 0}}},
-            {'$sort': {'solo_high_score': -1, 'created_at': 1}},
-            {'$limit': limit},
-            {'$project': {
-                'user_id': 1,
-                'name': 1,
-                'solo_high_score': 1,
-                'created_at': 1
-            }}
-        ]
+        limit = max(1, min(limit, 100))  # 1 ~ 100개까지만 조회
         
+        # 최고 점수 기준 랭킹 (솔로 게임, 랭킹 캐시)
         rankings = []
-        for i, doc in enumerate(db.users.aggregate(pipeline), 1):
+        for i, entry in enumerate(ranking_cache.top_scores(limit), 1):
             rankings.append({
                 'rank': i,
-                'user_id': doc.get('user_id'),
-                'name': doc.get('name'),
-                'score': doc.get('solo_high_score', 0),
-                'created_at': doc.get('created_at')
+                'user_id': entry['user_id'],
+                'name': entry['name'],
+                'score': entry['solo_high_score'],
+                'created_at': entry['created_at']
             })
         
         return jsonify({
@@ -449,32 +456,17 @@ def api_get_wins_ranking():
     """승리 횟수 랭킹 조회 API"""
     try:
         limit = request.args.get('limit', 100, type=int)
-        limit = min(limit, 100)  # 최대 100개까지만 조회
-        
-        from app.utils.database import get_db
-        db = get_db()
-        
-        # 승리 횟수 기준 랭킹
-        pipeline = [
-            {'$match': {'wins': {'$gt': 0}}},
-            {'$sort': {'wins': -1, 'created_at': 1}},
-            {'$limit': limit},
-            {'$project': {
-                'user_id': 1,
-                'name': 1,
-                'wins': 1,
-                'created_at': 1
-            }}
-        ]
+        limit = max(1, min(limit, 100))  # 1 ~ 100개까지만 조회
         
+        # 승리 횟수 기준 랭킹 (랭킹 캐시)
         rankings = []
-        for i, doc in enumerate(db.users.aggregate(pipeline), 1):
+        for i, entry in enumerate(ranking_cache.top_wins(limit), 1):
             rankings.append({
                 'rank': i,
-                'user_id': doc.get('user_id'),
-                'name': doc.get('name'),
-                'wins': doc.get('wins', 0),
-                'created_at': doc.get('created_at')
+                'user_id': entry['user_id'],
+                'name': entry['name'],
+                'wins': entry['wins'],
+                'created_at': entry['created_at']
             })
         
         return jsonify({
@@ -485,3 +477,104 @@ def api_get_wins_ranking():
     except Exception as e:
         current_app.logger.error(f"Get wins ranking error: {str(e)}")
         return jsonify({'error': '승리 랭킹 조회 중 오류가 발생했습니다'}), 500
+
+
+@main_bp.route('/api/ranking/me', methods=['GET'])
+@jwt_required()
+def api_get_my_ranking():
+    """내 순위 조회 API (JWT 인증)"""
+    try:
+        user_id = get_jwt_identity()
+        
+        # 사용자 조회
+        user = User.find_by_user_id(user_id)
+        if not user:
+            return jsonify({'error': '사용자를 찾을 수 없습니다'}), 404
+        
+        # 순서 통계 인덱스로 순위 및 백분위 계산
+        ranking = user_rank_index.lookup(user)
+        
+        return jsonify({
+            'user_id': user.user_id,
+            'name': user.name,
+            'score': ranking['score'],
+            'wins': ranking['wins']
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Get my ranking error: {str(e)}")
+        return jsonify({'error': '내 순위 조회 중 오류가 발생했습니다'}), 500
+
+
+@main_bp.route('/api/ranking/period/<window>', methods=['GET'])
+def api_get_period_ranking(window):
+    """기간별(daily/weekly/season) 랭킹 조회 API"""
+    try:
+        if window not in PeriodLeaderboard.WINDOWS:
+            return jsonify({'error': '지원하지 않는 기간입니다 (daily, weekly, season)'}), 400
+        
+        board = request.args.get('type', 'score')
+        if board not in ('score', 'wins'):
+            return jsonify({'error': '랭킹 종류는 score 또는 wins여야 합니다'}), 400
+        
+        mode = request.args.get('mode', 'solo')
+        if mode not in PeriodLeaderboard.SCORE_FIELDS:
+            return jsonify({'error': '게임 종류는 solo 또는 multiplayer여야 합니다'}), 400
+        
+        limit = request.args.get('limit', 100, type=int)
+        limit = max(1, min(limit, 100))  # 1 ~ 100개까지만 조회
+        
+        # 게임 기록 저장 시 갱신된 기간 버킷에서 조회 (period 미지정 시 현재 기간)
+        period, rankings = PeriodLeaderboard.top(
+            window, board, limit, request.args.get('period'), mode
+        )
+        
+        return jsonify({
+            'window': window,
+            'period': period,
+            'type': board,
+            'mode': mode,
+            'rankings': rankings,
+            'total_count': len(rankings)
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Get period ranking error: {str(e)}")
+        return jsonify({'error': '기간별 랭킹 조회 중 오류가 발생했습니다'}), 500
+
+
+# 관리자 API
+@main_bp.route('/api/admin/profile', methods=['POST'])
+@jwt_required()
+def api_admin_profile():
+    """샘플링 프로파일러 실행 API (JWT 인증, 관리자 전용)
+
+    이 워커를 seconds초 동안 샘플링하여 collapsed stack(flamegraph 입력) 텍스트를 반환합니다.
+    """
+    try:
+        user_id = get_jwt_identity()
+        if user_id not in current_app.config['ADMIN_USER_IDS']:
+            return jsonify({'error': '관리자 권한이 필요합니다'}), 403
+        
+        seconds = request.args.get('seconds', 10, type=float)
+        hz = request.args.get('hz', 100, type=int)
+        if not 0 < seconds <= current_app.config['PROFILER_MAX_SECONDS']:
+            return jsonify({'error': f"seconds는 0 초과 {current_app.config['PROFILER_MAX_SECONDS']} 이하여야 합니다"}), 400
+        if not 1 <= hz <= current_app.config['PROFILER_MAX_HZ']:
+            return jsonify({'error': f"hz는 1 이상 {current_app.config['PROFILER_MAX_HZ']} 이하여야 합니다"}), 400
+        include_idle = request.args.get('idle', 'false').lower() == 'true'
+        
+        # 프로파일링 동안 요청 greenlet은 양보하므로 다른 요청/소켓 처리는 계속됨
+        socketio = current_app.extensions['socketio']
+        collapsed = sampling_profiler.profile(seconds, hz, include_idle, sleep=socketio.sleep)
+        
+        response = make_response(collapsed)
+        response.headers['Content-Type'] = 'text/plain; charset=utf-8'
+        response.headers['X-Profile-Samples'] = str(sampling_profiler.samples)
+        return response
+        
+    except ProfilerBusy as e:
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        current_app.logger.error(f"Admin profile error: {str(e)}")
+        return jsonify({'error': '프로파일링 중 오류가 발생했습니다'}), 500
@@ -0,0 +1,166 @@
+"""
+대전 모드 상대 보드 스트리밍 티커
+플레이어가 보낸 보드(행 비트마스크)를 방별로 모아 틱마다 최대 한 번
+game:board_update를 전송합니다. 변경된 행만 [행 번호, 비트마스크] 델타로 보내고,
+일정 틱마다 전체 보드 키프레임을 보내 누락된 델타를 복구합니다.
+보드는 보낸 플레이어의 연결을 제외한(skip_sid) 방 전체에 전송되어 자기 보드를 되돌려 받지 않습니다.
+ROOM_TIMEOUT 동안 보드가 들어오지 않은 방(버려진 방)의 상태는 주기적으로 정리합니다.
+"""
+import logging
+import threading
+import time
+
+from app.engine.game import FULL_ROW
+from app.engine.pieces import ROWS
+
+
+def validate_board(rows):
+    """보드 형식 검증 (ROWS개의 0 ~ FULL_ROW 정수)"""
+    if not isinstance(rows, list) or len(rows) != ROWS:
+        return False
+    return all(isinstance(row, int) and 0 <= row <= FULL_ROW for row in rows)
+
+
+class PlayerBoard:
+    """플레이어 한 명의 최신 보드와 마지막으로 전송한 보드"""
+
+    __slots__ = ('latest', 'sent', 'ticks_since_keyframe', 'sid')
+
+    def __init__(self):
+        self.sid = None  # 마지막으로 보드를 보낸 연결 (이 연결에는 전송하지 않음)
+        self.latest = None
+        self.sent = None
+        self.ticks_since_keyframe = 0
+
+
+class BoardBroadcaster:
+    """방별 보드 변경을 모아 델타/키프레임으로 브로드캐스트"""
+
+    def __init__(self):
+        self.socketio = None
+        self.interval = 0.2
+        self.keyframe_ticks = 25
+        self.idle_timeout = 600
+        self._boards = {}  # room_id -> {user_id: PlayerBoard}
+        self._touched = {}  # room_id -> 마지막 보드 수신 시각
+        self._last_sweep = time.time()
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._task = None
+        # 관측용 카운터
+        self.emit_count = 0
+        self.row_count = 0
+
+    def init_app(self, app, socketio):
+        """앱 설정으로 초기화"""
+        self.socketio = socketio
+        self.interval = 1.0 / app.config.get('BOARD_BROADCAST_HZ', 5)
+        self.keyframe_ticks = app.config.get('BOARD_KEYFRAME_TICKS', 25)
+        self.idle_timeout = app.config.get('ROOM_TIMEOUT', 600)
+
+    def update(self, room_id, user_id, rows, sid=None):
+        """플레이어의 최신 보드 기록 (같은 틱 내에서는 최신 값만 전송, sid: 보낸 연결)"""
+        with self._lock:
+            players = self._boards.setdefault(room_id, {})
+            board = players.get(user_id)
+            if board is None:
+                board = players[user_id] = PlayerBoard()
+            board.latest = rows
+            board.sid = sid
+            self._touched[room_id] = time.time()
+            self._dirty.add(room_id)
+        self._ensure_started()
+
+    def request_keyframe(self, room_id):
+        """다음 틱에 방의 모든 보드를 키프레임으로 전송 (재접속/관전 참가 등)"""
+        with self._lock:
+            players = self._boards.get(room_id)
+            if not players:
+                return
+            for board in players.values():
+                board.sent = None
+            self._dirty.add(room_id)
+
+    def discard(self, room_id):
+        """방의 보드 상태 제거 (게임 종료 등)"""
+        with self._lock:
+            self._boards.pop(room_id, None)
+            self._touched.pop(room_id, None)
+            self._dirty.discard(room_id)
+
+    def sweep(self, now=None):
+        """idle_timeout 동안 보드가 들어오지 않은 방의 상태 제거 (제거한 방 수 반환)"""
+        now = now or time.time()
+        with self._lock:
+            idle = [room_id for room_id, at in self._touched.items() if now - at >= self.idle_timeout]
+        for room_id in idle:
+            self.discard(room_id)
+        return len(idle)
+
+    def snapshot(self, room_id):
+        """방의 플레이어별 최신 보드 {user_id: rows}"""
+        with self._lock:
+            return {
+                user_id: list(board.latest)
+                for user_id, board in self._boards.get(room_id, {}).items()
+                if board.latest is not None
+            }
+
+    def build_payload(self, room_id):
+        """방의 변경 사항으로 전송할 [(보낸 연결, 보드 항목)] 생성 (변경이 없으면 빈 목록)"""
+        boards = []
+        with self._lock:
+            for user_id, board in self._boards.get(room_id, {}).items():
+                if board.latest is None:
+                    continue
+                board.ticks_since_keyframe += 1
+                if board.sent is None or board.ticks_since_keyframe >= self.keyframe_ticks:
+                    boards.append((board.sid, {'user_id': user_id, 'keyframe': True, 'rows': list(board.latest)}))
+                    self.row_count += ROWS
+                    board.ticks_since_keyframe = 0
+                else:
+                    changed = [
+                        [index, row]
+                        for index, (row, previous) in enumerate(zip(board.latest, board.sent))
+                        if row != previous
+                    ]
+                    if not changed:
+                        continue
+                    boards.append((board.sid, {'user_id': user_id, 'keyframe': False, 'rows': changed}))
+                    self.row_count += len(changed)
+                board.sent = board.latest
+        return boards
+
+    def flush(self):
+        """대기 중인 방들의 보드 변경을 한 번씩 브로드캐스트"""
+        with self._lock:
+            rooms, self._dirty = self._dirty, set()
+
+        emitted = 0
+        for room_id in rooms:
+            # 플레이어별로 본인 연결을 제외하고 전송 (대전에서는 상대 보드만 받음)
+            for sid, board in self.build_payload(room_id):
+                self.socketio.emit('game:board_update', {'boards': [board]}, room=room_id, skip_sid=sid)
+                emitted += 1
+        self.emit_count += emitted
+        return emitted
+
+    def _ensure_started(self):
+        if self._task is None and self.socketio is not None:
+            self._task = self.socketio.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.interval)
+            try:
+                self.flush()
+                now = time.time()
+                if now - self._last_sweep >= min(self.idle_timeout, 60):
+                    self._last_sweep = now
+                    self.sweep(now)
+            except Exception as e:
+                logging.error(f"Board broadcast tick error: {str(e)}")
+
+
+# 보드 브로드캐스터 인스턴스 (전역)
+board_broadcaster = BoardBroadcaster()
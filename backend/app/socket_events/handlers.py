@@ -1,12 +1,22 @@
-from flask_socketio import emit, join_room, leave_room, disconnect
+from flask_socketio import emit, join_room, leave_room, disconnect, rooms
 from flask import current_app, request
 from flask_jwt_extended import decode_token
 from app.models.user import User
 from app.models.game_room import GameRoom
+from app.utils.room_registry import room_registry
+from app.utils.score_write_behind import score_write_behind
+from app.utils.replay_verifier import replay_verifier, VERIFIED
+from app.utils.match_commit import match_committer, MatchCommit
+from app.engine.replay import encode_input_log
+from app.socket_events.sessions import socket_sessions
+from app.socket_events.instrumentation import socket_metrics
+from app.socket_events.score_ticker import score_broadcaster
+from app.socket_events.board_ticker import board_broadcaster, validate_board
+from app.socket_events.spectator_ticker import spectator_broadcaster, spectator_room
 
 
 def authenticate_socket_jwt(token):
-    """Socket.IO 연결 시 JWT 기반 인증"""
+    """Socket.IO 연결 시 JWT 기반 인증 (성공 시 sid별 세션 생성)"""
     try:
         if not token:
             return None, "인증 토큰이 필요합니다"
@@ -23,6 +33,9 @@ def authenticate_socket_jwt(token):
         if not user:
             return None, "사용자를 찾을 수 없습니다"
         
+        # 이후 이벤트에서 재사용할 세션 저장 (토큰 만료 시각까지 유효)
+        socket_sessions.create(request.sid, user, decoded.get('exp'))
+        
         return user, None
         
     except Exception as e:
@@ -31,30 +44,43 @@ def authenticate_socket_jwt(token):
 
 
 def get_current_user_from_socket():
-    """Socket.IO 요청에서 쿠키의 JWT 토큰으로 사용자 정보 조회"""
+    """Socket.IO 요청의 사용자 정보 조회 (연결 세션 우선, 없으면 쿠키 JWT로 재인증)"""
     try:
-        # 쿠키에서 JWT 토큰 추출
+        # 연결 시 인증된 세션이 있으면 그대로 사용
+        session = socket_sessions.get(request.sid)
+        if session:
+            return session.user, None
+        
+        # 세션이 없거나 토큰이 만료된 경우 쿠키에서 JWT 토큰 추출
         token = None
         if hasattr(request, 'cookies'):
             token = request.cookies.get('access_token')
         
-        if not token:
-            return None, "인증 토큰이 필요합니다"
-        
-        decoded = decode_token(token)
-        user_id = decoded['sub']
-        
-        user = User.find_by_user_id(user_id)
-        if not user:
-            return None, "사용자를 찾을 수 없습니다"
-        
-        return user, None
+        return authenticate_socket_jwt(token)
         
     except Exception as e:
         current_app.logger.error(f"Get user from socket error: {str(e)}")
         return None, "인증 실패"
 
 
+def release_room(room_id):
+    """진행 중인 방의 메모리 상태 정리 (게임 중 점수는 먼저 저장)"""
+    score_write_behind.flush(room_id)
+    room_registry.evict(room_id)
+    score_broadcaster.discard(room_id)
+    board_broadcaster.discard(room_id)
+    spectator_broadcaster.discard(room_id)
+
+
+def _has_other_sockets(socketio, room_id, sid):
+    """이 워커에서 sid 외에 room_id에 남아 있는 소켓이 있는지 확인"""
+    for participant in socketio.server.manager.get_participants('/', room_id):
+        other = participant[0] if isinstance(participant, tuple) else participant
+        if other != sid:
+            return True
+    return False
+
+
 def register_connection_events(socketio):
     """연결 관련 이벤트 등록"""
     
@@ -98,7 +124,26 @@ def register_connection_events(socketio):
     @socketio.on('disconnect')
     def handle_disconnect():
         """클라이언트 연결 해제 시"""
-        # JWT 정보는 연결 시에만 확인하므로 disconnect에서는 단순 로그
+        # 연결 세션 및 관전 정보 정리
+        socket_sessions.invalidate(request.sid)
+        spectated_room_id = spectator_broadcaster.remove(request.sid)
+        
+        # room:leave/game:end 없이 끊긴 방은 이 워커에 남은 참가자/관전자 소켓이 없으면 메모리에서 정리
+        # (재접속 시 room_registry.load가 DB에서 다시 읽음)
+        try:
+            candidates = {room_id for room_id in rooms() if room_id != request.sid}
+            if spectated_room_id:
+                candidates.add(spectated_room_id)
+            for room_id in candidates:
+                if room_id not in room_registry:
+                    continue
+                if _has_other_sockets(socketio, room_id, request.sid):
+                    continue
+                if _has_other_sockets(socketio, spectator_room(room_id), request.sid):
+                    continue
+                release_room(room_id)
+        except Exception as e:
+            current_app.logger.error(f"Disconnect cleanup error: {str(e)}")
         current_app.logger.info(f"Socket disconnected")
 
 
@@ -118,23 +163,25 @@ def register_room_events(socketio):
             if not room_id:
                 emit('error', {'type': 'VALIDATION_ERROR', 'message': '방 번호가 필요합니다'})
                 return
-            # 방 조회
-            room = GameRoom.find_by_room_id(room_id)
+            # 방 조회 (진행 중인 방은 레지스트리에서, 참가 직후면 참가 API가 보관한 상태 재사용)
+            room = room_registry.load(room_id)
             if not room:
                 emit('error', {'type': 'ROOM_NOT_FOUND', 'message': '존재하지 않는 방입니다'})
                 return
-            # Socket.IO 방에 참가
+            # Socket.IO 방에 참가 (재접속 시 상대 보드를 전체로 다시 받도록 키프레임 요청)
             join_room(room_id)
+            board_broadcaster.request_keyframe(room_id)
 
             # 참가자 수가 2명이 되면 서버가 자동으로 게임 시작 알림을 브로드캐스트
             if len(room.participants) == 2:
-                # 게임 시작 처리 (room.start_game() 등 필요시 호출)
-                if hasattr(room, 'start_game'):
-                    room.start_game()
+                # 게임 시작 처리 후 진행 중인 방을 레지스트리에 등록
+                room.start_game()
+                room = room_registry.register(room)
                 players = [{'name': p['name'], 'user_id': p['user_id'], 'score': 0} for p in room.participants]
                 socketio.emit('game:start', {
                     'players': players,
-                    'game_time': 60  # 60초 게임
+                    'game_time': 60,  # 60초 게임
+                    'seed': room.seed  # 두 플레이어가 같은 피스 순서로 진행
                 }, room=room_id)
         except Exception as e:
             current_app.logger.error(f"Room join error: {str(e)}")
@@ -156,6 +203,9 @@ def register_room_events(socketio):
                 emit('error', {'type': 'VALIDATION_ERROR', 'message': '방 번호가 필요합니다'})
                 return
             
+            # 게임 중 점수를 저장하고 레지스트리와 브로드캐스트 상태에서 제거
+            release_room(room_id)
+
             # 방 나가기 알림을 방 내 다른 사용자에게 브로드캐스트
             socketio.emit('room:leave', {
                 'user_name': user.name,
@@ -196,26 +246,59 @@ def register_game_events(socketio):
             if not room_id:
                 emit('error', {'type': 'VALIDATION_ERROR', 'message': '방 번호가 필요합니다'})
                 return
+            if spectator_broadcaster.is_spectator(request.sid):
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '관전자는 게임 이벤트를 보낼 수 없습니다'})
+                return
             
-            # 방 조회 및 점수 업데이트
-            room = GameRoom.find_by_room_id(room_id)
+            # 메모리 상의 방 점수 업데이트 (DB 기록 없음)
+            room = room_registry.update_score(room_id, user.user_id, score)
             if room:
-                room.update_participant_score(user.user_id, score)
-                
-                # 업데이트된 플레이어 점수를 방 내 모든 사용자에게 브로드캐스트
-                players = [
-                    {'user_id': p['user_id'], 'score': p.get('score', 0)} 
-                    for p in room.participants
-                ]
-                
-                socketio.emit('game:score_update', {
-                    'players': players
-                }, room=room_id)
+                # DB에는 write-behind로 지연 저장
+                score_write_behind.mark(room_id, user.user_id, score)
+                # 다음 틱에 방 내 모든 사용자(관전자는 별도 주기)에게 최신 점수를 브로드캐스트
+                score_broadcaster.mark_dirty(room)
+                spectator_broadcaster.mark_dirty(room_id)
             
         except Exception as e:
             current_app.logger.error(f"Score update error: {str(e)}")
             emit('error', {'type': 'SERVER_ERROR', 'message': '점수 업데이트 중 오류가 발생했습니다'})
     
+    @socketio.on('game:board_update')
+    def handle_board_update(data):
+        """상대 보드 스트리밍용 보드 업데이트 (쿠키 기반 JWT 인증)"""
+        try:
+            user, error = get_current_user_from_socket()
+            
+            if error:
+                emit('error', {'type': 'AUTH_ERROR', 'message': error})
+                return
+            
+            room_id = data.get('room_id')
+            rows = data.get('rows')
+            
+            if not room_id:
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '방 번호가 필요합니다'})
+                return
+            if not validate_board(rows):
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '유효하지 않은 보드입니다'})
+                return
+            if spectator_broadcaster.is_spectator(request.sid):
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '관전자는 게임 이벤트를 보낼 수 없습니다'})
+                return
+            # 진행 중인 방의 참가자만 보드를 보낼 수 있음
+            room = room_registry.load(room_id)
+            if not room or room.status != 'playing' or not room.has_participant(user.user_id):
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '참가 중인 게임이 아닙니다'})
+                return
+            
+            # 다음 틱에 변경된 행만 방 내 다른 사용자에게 브로드캐스트 (관전자는 별도 주기)
+            board_broadcaster.update(room_id, user.user_id, rows, sid=request.sid)
+            spectator_broadcaster.mark_dirty(room_id)
+            
+        except Exception as e:
+            current_app.logger.error(f"Board update error: {str(e)}")
+            emit('error', {'type': 'SERVER_ERROR', 'message': '보드 업데이트 중 오류가 발생했습니다'})
+    
     @socketio.on('game:end')
     def handle_game_end(data):
         """게임 종료 처리 (쿠키 기반 JWT 인증) - 플레이어가 게임 완료 시 호출"""
@@ -233,17 +316,37 @@ def register_game_events(socketio):
             if not isinstance(final_score, int) or final_score < 0:
                 emit('error', {'type': 'VALIDATION_ERROR', 'message': '유효하지 않은 점수입니다'})
                 return
+            if spectator_broadcaster.is_spectator(request.sid):
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '관전자는 게임 이벤트를 보낼 수 없습니다'})
+                return
             # 방 조회
-            room = GameRoom.find_by_room_id(room_id)
+            room = room_registry.load(room_id)
             if not room:
                 emit('error', {'type': 'ROOM_NOT_FOUND', 'message': '존재하지 않는 방입니다'})
                 return
-            # 최종 점수 및 finished 상태 업데이트
-            for participant in room.participants:
-                if participant['user_id'] == user.user_id:
-                    participant['score'] = final_score
-                    participant['finished'] = True
-            room.save()
+            # 서버가 발급한 시드의 입력 로그를 재시뮬레이션하여 최종 점수 검증
+            input_log = data.get('replay')
+            accepted, verify_result = replay_verifier.verify(input_log, final_score, seed=room.seed)
+            if not accepted:
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '점수 검증에 실패했습니다'})
+                return
+            # 최종 점수 및 finished 상태를 원자적으로 업데이트
+            # (다른 워커에서 먼저 끝낸 참가자의 상태도 DB 기준으로 반영)
+            finished_room, modified = GameRoom.finish_participant(room_id, user.user_id, final_score)
+            if not finished_room or not finished_room.has_participant(user.user_id):
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '방 참가자가 아닙니다'})
+                return
+            if not modified:
+                # 이미 끝낸 참가자의 반복 요청: 방 정리나 결과 저장을 다시 하지 않음
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '이미 종료된 게임입니다'})
+                return
+            room.participants = finished_room.participants
+            # 검증된 리플레이는 게임 기록 저장 시까지 메모리에만 보관
+            if verify_result == VERIFIED:
+                room.replays[user.user_id] = encode_input_log(input_log)
+            # 최종 점수가 저장되었으므로 이 참가자의 대기 중인 게임 중 점수만 폐기
+            # (아직 플레이 중인 상대의 점수는 다음 flush에서 저장)
+            score_write_behind.discard(room_id, user.user_id)
             current_app.logger.info(f"Updated score/finished for user {user.user_id}: {final_score}")
 
             # 모든 플레이어가 게임을 마쳤는지 확인 (finished 플래그로 체크)
@@ -258,40 +361,24 @@ def register_game_events(socketio):
                 # 승자 결정 (점수가 가장 높은 플레이어)
                 winner = max(room.participants, key=lambda p: p.get('score', 0))
                 scores = {p['user_id']: p.get('score', 0) for p in room.participants}
-                # 게임 종료
-                room.end_game(scores)
-                # 게임 기록 저장
-                from app.models.game_record import GameRecord
-                players_data = [
-                    {'user_id': p['user_id'], 'name': p['name'], 'score': p.get('score', 0)}
-                    for p in room.participants
-                ]
-                GameRecord.create_multiplayer_record(
-                    room_id, players_data, scores, winner['user_id'], 60
-                )
-                # 사용자 통계 업데이트
                 is_draw = len([p for p in room.participants if p.get('score', 0) == winner.get('score', 0)]) > 1
-                for participant in room.participants:
-                    participant_user = User.find_by_user_id(participant['user_id'])
-                    if participant_user:
-                        if is_draw:
-                            game_result = 'draw'
-                        else:
-                            is_winner = participant['user_id'] == winner['user_id']
-                            game_result = 'win' if is_winner else 'loss'
-                        participant_user.update_stats(
-                            score_gained=participant.get('score', 0),
-                            game_result=game_result
-                        )
+                # 게임 종료 후 레지스트리에서 제거
+                room_registry.evict(room_id)
+                score_broadcaster.discard(room_id)
+                board_broadcaster.discard(room_id)
+                spectator_broadcaster.discard(room_id)
                 result.update({
                     'message': '게임이 종료되었습니다',
                     'status': 'finished',
                     'final_scores': scores,
                     'winner': winner['user_id'],
-                    'is_draw': len([p for p in room.participants if p.get('score', 0) == winner.get('score', 0)]) > 1
+                    'is_draw': is_draw
                 })
-                # 게임 종료 결과를 방 내 모든 사용자에게 브로드캐스트
+                # 게임 종료 결과를 방 내 모든 사용자와 관전자에게 브로드캐스트
                 socketio.emit('game:end', result, room=room_id)
+                socketio.emit('game:end', result, room=spectator_room(room_id))
+                # 방 종료, 게임 기록, 사용자 통계 저장은 종료 알림 후 한 단계로 처리
+                match_committer.submit(MatchCommit(room, scores, winner['user_id'], is_draw))
             else:
                 # waiting 상태를 game:end 응답에 포함 (별도 이벤트 emit하지 않음)
                 result.update({
@@ -303,8 +390,59 @@ def register_game_events(socketio):
             current_app.logger.error(f"Game end error: {str(e)}")
             emit('error', {'type': 'SERVER_ERROR', 'message': '게임 종료 처리 중 오류가 발생했습니다'})
 
+def register_spectator_events(socketio):
+    """관전 관련 이벤트 등록"""
+    
+    @socketio.on('spectate:join')
+    def handle_spectate_join(data):
+        """관전 참가 (쿠키 기반 JWT 인증, 읽기 전용)"""
+        try:
+            user, error = get_current_user_from_socket()
+            if error:
+                emit('error', {'type': 'AUTH_ERROR', 'message': error})
+                return
+            room_id = data.get('room_id')
+            if not room_id:
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '방 번호가 필요합니다'})
+                return
+            room = room_registry.load(room_id)
+            if not room:
+                emit('error', {'type': 'ROOM_NOT_FOUND', 'message': '존재하지 않는 방입니다'})
+                return
+            if any(p['user_id'] == user.user_id for p in room.participants):
+                emit('error', {'type': 'VALIDATION_ERROR', 'message': '참가 중인 방은 관전할 수 없습니다'})
+                return
+            
+            # 다른 방을 관전 중이었다면 먼저 나가기
+            previous_room_id = spectator_broadcaster.remove(request.sid)
+            if previous_room_id:
+                leave_room(spectator_room(previous_room_id))
+            
+            # 관전자 전용 방에 참가 후 현재 상태를 본인에게 전송
+            join_room(spectator_room(room_id))
+            spectator_broadcaster.add(room_id, request.sid)
+            emit('spectate:update', spectator_broadcaster.build_snapshot(room_id))
+        except Exception as e:
+            current_app.logger.error(f"Spectate join error: {str(e)}")
+            emit('error', {'type': 'SERVER_ERROR', 'message': '관전 참가 중 오류가 발생했습니다'})
+    
+    @socketio.on('spectate:leave')
+    def handle_spectate_leave(data):
+        """관전 종료"""
+        try:
+            room_id = spectator_broadcaster.remove(request.sid)
+            if room_id:
+                leave_room(spectator_room(room_id))
+        except Exception as e:
+            current_app.logger.error(f"Spectate leave error: {str(e)}")
+            emit('error', {'type': 'SERVER_ERROR', 'message': '관전 종료 중 오류가 발생했습니다'})
+
+
 def register_all_events(socketio):
     """모든 Socket.IO 이벤트 등록"""
     register_connection_events(socketio)
     register_room_events(socketio)
-    register_game_events(socketio)
\ No newline at end of file
+    register_game_events(socketio)
+    register_spectator_events(socketio)
+    # 등록된 모든 핸들러에 처리 시간/오류/emit 계측 적용
+    socket_metrics.instrument(socketio)
\ No newline at end of file
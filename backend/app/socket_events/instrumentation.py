@@ -0,0 +1,151 @@
+"""
+Socket.IO 이벤트 계측
+register_all_events로 등록된 핸들러를 감싸 이벤트별 처리 시간 히스토그램,
+수신/오류 횟수, 이벤트별 emit 횟수를 수집합니다. 이벤트 이름별 통계 객체를
+미리 만들어 두고 정수 덧셈만 하므로 (락/할당 없음) 운영 환경에서도 켜 둡니다.
+값은 /metrics 요청 시 Prometheus 텍스트 형식으로 변환됩니다.
+"""
+import bisect
+import functools
+import threading
+import time
+
+from app.utils.metrics import metrics, DEFAULT_BUCKETS
+
+# 현재 greenlet이 처리 중인 이벤트 (emit 'error' 발생 시 어느 이벤트의 오류인지 기록)
+_current = threading.local()
+
+
+class EventStats:
+    """이벤트 하나의 누적 통계"""
+
+    __slots__ = ('received', 'errors', 'emitted', 'buckets', 'duration_sum')
+
+    def __init__(self, bucket_count):
+        self.received = 0
+        self.errors = 0
+        self.emitted = 0
+        self.buckets = [0] * (bucket_count + 1)
+        self.duration_sum = 0.0
+
+
+class _EventMetric:
+    """EventStats 묶음을 메트릭 레지스트리 형식으로 노출"""
+
+    def __init__(self, name, help_text, kind, sampler):
+        self.name = metrics.prefix + name
+        self.help = help_text
+        self.kind = kind
+        self._sampler = sampler
+
+    def samples(self):
+        return self._sampler(self.name)
+
+
+class SocketEventMetrics:
+    """Socket.IO 이벤트별 통계"""
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.events = {}
+        self.connected = metrics.gauge('socketio_connected_sockets', 'Authenticated Socket.IO connections')
+        self.live_rooms = metrics.gauge('socketio_live_rooms', 'Rooms with a game in progress on this worker')
+        metrics.register(_EventMetric(
+            'socketio_events_total', 'Inbound Socket.IO events handled', 'counter',
+            lambda name: self._counter_samples(name, 'received')
+        ))
+        metrics.register(_EventMetric(
+            'socketio_event_errors_total', 'Socket.IO events that raised or answered with an error', 'counter',
+            lambda name: self._counter_samples(name, 'errors')
+        ))
+        metrics.register(_EventMetric(
+            'socketio_emits_total', 'Outbound Socket.IO emits by event name', 'counter',
+            lambda name: self._counter_samples(name, 'emitted')
+        ))
+        metrics.register(_EventMetric(
+            'socketio_event_duration_seconds', 'Socket.IO handler duration', 'histogram',
+            self._histogram_samples
+        ))
+        metrics.register_collector(self._collect_gauges)
+
+    def stats_for(self, event):
+        stats = self.events.get(event)
+        if stats is None:
+            stats = self.events[event] = EventStats(len(self.bounds))
+        return stats
+
+    def instrument(self, socketio, namespace='/'):
+        """등록된 모든 핸들러와 서버 emit을 계측 함수로 교체"""
+        handlers = socketio.server.handlers.get(namespace, {})
+        for event, handler in list(handlers.items()):
+            handlers[event] = self._wrap(event, handler)
+
+        server = socketio.server
+        original_emit = server.emit
+
+        @functools.wraps(original_emit)
+        def emit(event, *args, **kwargs):
+            self.stats_for(event).emitted += 1
+            if event == 'error':
+                current = getattr(_current, 'stats', None)
+                if current is not None:
+                    current.errors += 1
+            return original_emit(event, *args, **kwargs)
+
+        server.emit = emit
+
+    def _wrap(self, event, handler):
+        stats = self.stats_for(event)
+        bounds = self.bounds
+        activity = f"socket:{event}"
+
+        @functools.wraps(handler)
+        def instrumented(*args, **kwargs):
+            _stall_activity = activity  # noqa: F841 (정지 감지기가 프레임에서 읽음)
+            previous = getattr(_current, 'stats', None)
+            _current.stats = stats
+            started = time.perf_counter()
+            try:
+                return handler(*args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                stats.received += 1
+                stats.buckets[bisect.bisect_left(bounds, elapsed)] += 1
+                stats.duration_sum += elapsed
+                _current.stats = previous
+
+        return instrumented
+
+    def _counter_samples(self, name, field):
+        return [
+            (name, (('event', event),), getattr(stats, field))
+            for event, stats in sorted(self.events.items())
+        ]
+
+    def _histogram_samples(self, name):
+        samples = []
+        for event, stats in sorted(self.events.items()):
+            if not stats.received:
+                continue
+            label = (('event', event),)
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float('inf'),), stats.buckets):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                samples.append((f"{name}_bucket", label + (('le', le),), cumulative))
+            samples.append((f"{name}_sum", label, stats.duration_sum))
+            samples.append((f"{name}_count", label, stats.received))
+        return samples
+
+    def _collect_gauges(self):
+        from app.socket_events.sessions import socket_sessions
+        from app.utils.room_registry import room_registry
+        self.connected.set(len(socket_sessions))
+        self.live_rooms.set(len(room_registry))
+
+
+# Socket.IO 이벤트 계측 인스턴스 (전역)
+socket_metrics = SocketEventMetrics()
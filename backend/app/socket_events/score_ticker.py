@@ -0,0 +1,65 @@
+"""
+방 단위 점수 브로드캐스트 티커
+클라이언트의 점수 업데이트를 즉시 재전송하지 않고, 틱마다 방별로
+최신 점수만 모아 최대 한 번의 game:score_update를 전송합니다.
+"""
+import logging
+import threading
+
+
+class ScoreBroadcaster:
+    """방별 점수 변경을 모아 일정 주기로 브로드캐스트"""
+
+    def __init__(self):
+        self.socketio = None
+        self.interval = 0.1
+        self._dirty = {}  # room_id -> GameRoom (최신 상태)
+        self._lock = threading.Lock()
+        self._task = None
+
+    def init_app(self, app, socketio):
+        """앱 설정으로 초기화"""
+        self.socketio = socketio
+        self.interval = 1.0 / app.config.get('SCORE_BROADCAST_HZ', 10)
+
+    def mark_dirty(self, room):
+        """다음 틱에 브로드캐스트할 방 등록 (같은 틱 내에서는 최신 값만 전송)"""
+        with self._lock:
+            self._dirty[room.room_id] = room
+        self._ensure_started()
+
+    def discard(self, room_id):
+        """대기 중인 브로드캐스트 취소 (게임 종료 등)"""
+        with self._lock:
+            self._dirty.pop(room_id, None)
+
+    def flush(self):
+        """대기 중인 방들의 점수를 한 번씩 브로드캐스트"""
+        with self._lock:
+            rooms, self._dirty = self._dirty, {}
+
+        for room_id, room in rooms.items():
+            players = [
+                {'user_id': p['user_id'], 'score': p.get('score', 0)}
+                for p in room.participants
+            ]
+            self.socketio.emit('game:score_update', {
+                'players': players
+            }, room=room_id)
+        return len(rooms)
+
+    def _ensure_started(self):
+        if self._task is None and self.socketio is not None:
+            self._task = self.socketio.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Score broadcast tick error: {str(e)}")
+
+
+# 점수 브로드캐스터 인스턴스 (전역)
+score_broadcaster = ScoreBroadcaster()
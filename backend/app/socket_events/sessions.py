@@ -0,0 +1,59 @@
+"""
+Socket.IO 연결별 인증 세션 캐시
+연결(connect) 시 한 번 인증한 사용자를 sid별로 보관하여
+이후 이벤트마다 JWT 검증과 사용자 조회를 반복하지 않도록 합니다.
+"""
+import threading
+import time
+
+
+class SocketSession:
+    """소켓 연결 하나에 대한 인증 세션"""
+
+    def __init__(self, user, expires_at=None):
+        self.user = user
+        self.expires_at = expires_at  # JWT exp (epoch seconds)
+        self.connected_at = time.time()
+
+    def is_expired(self, now=None):
+        """토큰 만료 여부 확인"""
+        if self.expires_at is None:
+            return False
+        return (now or time.time()) >= self.expires_at
+
+
+class SessionStore:
+    """sid -> SocketSession 저장소"""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self, sid, user, expires_at=None):
+        """세션 생성"""
+        session = SocketSession(user, expires_at)
+        with self._lock:
+            self._sessions[sid] = session
+        return session
+
+    def get(self, sid):
+        """유효한 세션 반환 (만료된 세션은 제거 후 None)"""
+        session = self._sessions.get(sid)
+        if session is None:
+            return None
+        if session.is_expired():
+            self.invalidate(sid)
+            return None
+        return session
+
+    def invalidate(self, sid):
+        """세션 제거"""
+        with self._lock:
+            return self._sessions.pop(sid, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+# 세션 저장소 인스턴스 (전역)
+socket_sessions = SessionStore()
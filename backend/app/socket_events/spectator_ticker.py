@@ -0,0 +1,138 @@
+"""
+관전자 팬아웃 티커
+관전자는 방마다 별도의 Socket.IO 방("{room_id}:spectators")에 읽기 전용으로 참가하며,
+플레이어보다 낮은 주기로 점수와 보드 스냅샷을 받습니다.
+틱마다 방별로 페이로드를 한 번만 만들고 관전자 방 전체에 한 번 emit하므로
+패킷 직렬화는 관전자 수와 관계없이 한 번만 일어납니다.
+
+다중 워커(SOCKETIO_MESSAGE_QUEUE)에서는 관전자가 다른 워커에 접속해 있을 수 있으므로
+플레이어가 있는 워커가 관전자 유무와 관계없이 스냅샷을 만들고, 메시지 큐 매니저를 거쳐
+모든 워커의 관전자 방으로 보냅니다. 이때 스냅샷의 보드는 그 워커에 접속한 플레이어의
+것만 포함되므로 클라이언트는 boards를 user_id 기준으로 합쳐서 표시합니다.
+"""
+import logging
+import threading
+
+from app.utils.room_registry import room_registry
+
+
+def spectator_room(room_id):
+    """관전자용 Socket.IO 방 이름"""
+    return f"{room_id}:spectators"
+
+
+class SpectatorBroadcaster:
+    """방별 관전자 목록과 관전용 스냅샷 전송 관리"""
+
+    def __init__(self):
+        self.socketio = None
+        self.interval = 0.5
+        self.board_source = None
+        self.shared = False  # 메시지 큐로 다른 워커의 관전자에게도 전송하는지 여부
+        self._spectators = {}  # room_id -> {sid}
+        self._rooms_by_sid = {}  # sid -> room_id
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._task = None
+        # 관측용 카운터
+        self.emit_count = 0
+
+    def init_app(self, app, socketio, board_source=None):
+        """앱 설정으로 초기화 (board_source: 최신 보드를 제공하는 BoardBroadcaster)"""
+        self.socketio = socketio
+        self.interval = 1.0 / app.config.get('SPECTATOR_BROADCAST_HZ', 2)
+        self.board_source = board_source
+        self.shared = bool(app.config.get('SOCKETIO_MESSAGE_QUEUE'))
+
+    def add(self, room_id, sid):
+        """관전자 등록"""
+        with self._lock:
+            self._spectators.setdefault(room_id, set()).add(sid)
+            self._rooms_by_sid[sid] = room_id
+        self._ensure_started()
+
+    def remove(self, sid):
+        """관전자 제거 후 관전하던 방 번호 반환"""
+        with self._lock:
+            room_id = self._rooms_by_sid.pop(sid, None)
+            if room_id is None:
+                return None
+            sids = self._spectators.get(room_id)
+            if sids is not None:
+                sids.discard(sid)
+                if not sids:
+                    del self._spectators[room_id]
+                    if not self.shared:
+                        self._dirty.discard(room_id)
+        return room_id
+
+    def is_spectator(self, sid):
+        """관전자 연결 여부"""
+        return sid in self._rooms_by_sid
+
+    def spectator_count(self, room_id=None):
+        """관전자 수 (room_id가 없으면 전체)"""
+        if room_id is None:
+            return len(self._rooms_by_sid)
+        return len(self._spectators.get(room_id, ()))
+
+    def mark_dirty(self, room_id):
+        """관전자가 있을 수 있는 방이면 다음 틱에 스냅샷 전송
+
+        단일 워커에서는 이 워커의 관전자 목록으로 판단하고, 다중 워커에서는
+        다른 워커의 관전자를 알 수 없으므로 항상 전송합니다.
+        """
+        if self.shared:
+            with self._lock:
+                self._dirty.add(room_id)
+            self._ensure_started()
+        elif room_id in self._spectators:
+            with self._lock:
+                self._dirty.add(room_id)
+
+    def discard(self, room_id):
+        """대기 중인 스냅샷 전송 취소 (게임 종료 등)"""
+        with self._lock:
+            self._dirty.discard(room_id)
+
+    def build_snapshot(self, room_id):
+        """관전용 스냅샷 (점수 + 전체 보드)"""
+        room = room_registry.get(room_id)
+        players = [
+            {'user_id': p['user_id'], 'name': p['name'], 'score': p.get('score', 0)}
+            for p in room.participants
+        ] if room else []
+        boards = []
+        if self.board_source is not None:
+            boards = [
+                {'user_id': user_id, 'rows': rows}
+                for user_id, rows in self.board_source.snapshot(room_id).items()
+            ]
+        return {'room_id': room_id, 'players': players, 'boards': boards}
+
+    def flush(self):
+        """대기 중인 방마다 스냅샷을 한 번 만들어 관전자 방 전체에 한 번 전송"""
+        with self._lock:
+            rooms, self._dirty = self._dirty, set()
+
+        for room_id in rooms:
+            self.socketio.emit('spectate:update', self.build_snapshot(room_id),
+                               room=spectator_room(room_id))
+        self.emit_count += len(rooms)
+        return len(rooms)
+
+    def _ensure_started(self):
+        if self._task is None and self.socketio is not None:
+            self._task = self.socketio.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Spectator broadcast tick error: {str(e)}")
+
+
+# 관전자 브로드캐스터 인스턴스 (전역)
+spectator_broadcaster = SpectatorBroadcaster()
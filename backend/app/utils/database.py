@@ -2,14 +2,116 @@
 MongoDB 데이터베이스 연결 및 관리
 """
 import os
-from pymongo import MongoClient
+import threading
+import time
+from pymongo import MongoClient, monitoring
 from pymongo.errors import ConnectionFailure
 import logging
 
+from app.config import Config
+from app.utils.metrics import metrics
+
 # 전역 데이터베이스 변수
 db = None
 client = None
 
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """CMAP 이벤트로 커넥션 풀 사용량 수집
+
+    - checked_out: 사용 중인 커넥션 수
+    - waiters: 커넥션을 기다리는 요청 수
+    - wait 히스토그램: checkout 시작부터 획득(또는 실패)까지 걸린 시간
+    - created/closed: 커넥션 생성/종료 횟수 (churn)
+    """
+
+    def __init__(self):
+        # 커넥션마다 호출되므로 라벨 없는 지표는 자식을 미리 받아 두고 속성만 갱신
+        self.checked_out = metrics.gauge('mongo_pool_checked_out', 'MongoDB connections currently checked out').labels()
+        self.waiters = metrics.gauge('mongo_pool_waiters', 'Operations waiting for a MongoDB connection').labels()
+        self.wait_seconds = metrics.histogram(
+            'mongo_pool_wait_seconds', 'Time spent waiting to check out a MongoDB connection'
+        ).labels()
+        self.created = metrics.counter('mongo_pool_connections_created_total', 'MongoDB connections created').labels()
+        self.closed = metrics.counter('mongo_pool_connections_closed_total', 'MongoDB connections closed')
+        self.checkout_failed = metrics.counter(
+            'mongo_pool_checkout_failed_total', 'MongoDB connection checkouts that failed'
+        )
+        self.cleared = metrics.counter('mongo_pool_cleared_total', 'MongoDB pool clear events').labels()
+        # checkout 시작 시각 (monkey patch 환경에서는 greenlet별로 분리됨)
+        self._local = threading.local()
+
+    def _finish_wait(self):
+        started = getattr(self._local, 'started', None)
+        self._local.started = None
+        self.waiters.dec()
+        if started is not None:
+            self.wait_seconds.observe(time.perf_counter() - started)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.cleared.inc()
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.created.inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.closed.inc(reason=event.reason)
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+        self.waiters.inc()
+
+    def connection_check_out_failed(self, event):
+        self._finish_wait()
+        self.checkout_failed.inc(reason=event.reason)
+
+    def connection_checked_out(self, event):
+        self._finish_wait()
+        self.checked_out.inc()
+
+    def connection_checked_in(self, event):
+        self.checked_out.dec()
+
+    def stats(self):
+        """풀 사용량 요약"""
+        wait_sum, wait_count = self.wait_seconds.sum, self.wait_seconds.count
+        return {
+            'checked_out': self.checked_out.value,
+            'waiters': self.waiters.value,
+            'checkouts': wait_count,
+            'avg_wait_ms': round(wait_sum / wait_count * 1000, 3) if wait_count else 0.0,
+            'created': self.created.value,
+            'checkout_failed': sum(v for _, _, v in self.checkout_failed.samples())
+        }
+
+
+# 커넥션 풀 메트릭 리스너 (전역)
+pool_metrics = PoolMetricsListener()
+
+def client_options():
+    """MongoClient 커넥션 풀/타임아웃 옵션 (Config 기준)"""
+    return {
+        'maxPoolSize': Config.MONGO_MAX_POOL_SIZE,
+        'minPoolSize': Config.MONGO_MIN_POOL_SIZE,
+        'maxIdleTimeMS': Config.MONGO_MAX_IDLE_TIME_MS,
+        'waitQueueTimeoutMS': Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        'serverSelectionTimeoutMS': Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        'connectTimeoutMS': Config.MONGO_CONNECT_TIMEOUT_MS,
+        'socketTimeoutMS': Config.MONGO_SOCKET_TIMEOUT_MS,
+        'event_listeners': [pool_metrics]
+    }
+
 def init_db():
     """데이터베이스 연결 초기화"""
     global db, client
@@ -18,8 +120,8 @@ def init_db():
         # MongoDB URI 가져오기
         mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/jungle_tetris')
         
-        # MongoDB 클라이언트 생성
-        client = MongoClient(mongodb_uri)
+        # MongoDB 클라이언트 생성 (풀 크기/타임아웃 설정, CMAP 이벤트로 풀 사용량 수집)
+        client = MongoClient(mongodb_uri, **client_options())
         
         # 연결 테스트
         client.admin.command('ping')
@@ -59,6 +161,15 @@ def create_indexes():
         db.game_records.create_index("played_at")
         db.game_records.create_index([("game_type", 1), ("score", -1)])  # 랭킹용
         
+        # game_replays 컬렉션 인덱스 (리플레이 청크)
+        db.game_replays.create_index([("game_id", 1), ("user_id", 1), ("n", 1)])
+        
+        # leaderboard_buckets 컬렉션 인덱스 (기간별 리더보드)
+        db.leaderboard_buckets.create_index([("window", 1), ("period", 1), ("best_score", -1), ("updated_at", 1)])
+        db.leaderboard_buckets.create_index([("window", 1), ("period", 1), ("multi_best_score", -1), ("updated_at", 1)])
+        db.leaderboard_buckets.create_index([("window", 1), ("period", 1), ("wins", -1), ("updated_at", 1)])
+        db.leaderboard_buckets.create_index("expires_at", expireAfterSeconds=0)  # 지난 일간/주간 버킷 자동 삭제
+        
         # user_stats 컬렉션 인덱스
         db.user_stats.create_index("user_id", unique=True)
         db.user_stats.create_index("solo_best_score")
@@ -69,6 +180,35 @@ def create_indexes():
     except Exception as e:
         logging.error(f"❌ 인덱스 생성 실패: {e}")
 
+def check_cooperative_io(async_mode, policy='error'):
+    """비동기 모드에서 PyMongo 소켓 I/O가 이벤트 루프를 멈추지 않는지 시작 시 확인
+
+    eventlet 모드에서는 socket/select/thread/time 모듈이 monkey patch되어 있어야
+    PyMongo 호출이 greenlet 전환을 일으킵니다. 패치되지 않았으면 policy에 따라
+    예외('error') 또는 경고('warn')를 발생시킵니다 ('off'는 확인 안 함).
+    """
+    if async_mode != 'eventlet' or policy == 'off':
+        return True
+    
+    from eventlet import patcher
+    unpatched = [
+        name for name in ('socket', 'select', 'thread', 'time')
+        if not patcher.is_monkey_patched(name)
+    ]
+    if not unpatched:
+        logging.info("✅ 협력형 I/O 확인 완료 (eventlet monkey patch 적용됨)")
+        return True
+    
+    message = (
+        f"eventlet 모드에서 {', '.join(unpatched)} 모듈이 monkey patch되지 않았습니다. "
+        "PyMongo 호출이 이벤트 루프 전체를 멈추므로 다른 모듈을 import하기 전에 "
+        "eventlet.monkey_patch()를 호출하세요."
+    )
+    if policy == 'warn':
+        logging.warning(f"⚠️ {message}")
+        return False
+    raise RuntimeError(message)
+
 def get_db():
     """데이터베이스 인스턴스 반환"""
     global db
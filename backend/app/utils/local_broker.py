@@ -0,0 +1,200 @@
+"""
+로컬 메시지 브로커 (다중 워커용 Redis 대체)
+TCP 소켓 기반의 단순한 fan-out 브로커로, 한 호스트에서 여러 워커를 띄우거나
+테스트할 때 Redis 없이 Socket.IO emit과 방 상태를 워커 간에 전달합니다.
+
+브로커 실행:
+    python -m app.utils.local_broker --host 127.0.0.1 --port 6390
+
+프레임 형식: 4바이트 길이(big-endian) + pickle((channel, data))
+연결 직후 첫 프레임으로 역할(b'pub' 또는 b'sub')을 보내며, 브로커는 받은 프레임을
+구독(sub) 연결 전체(보낸 워커 포함)에 그대로 전달합니다.
+"""
+import argparse
+import logging
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import socketio
+
+DEFAULT_URL = 'local://127.0.0.1:6390'
+HEADER = struct.Struct('!I')
+ROLE_PUBLISHER = b'pub'
+ROLE_SUBSCRIBER = b'sub'
+
+
+def parse_url(url):
+    """local://host:port 형식의 URL을 (host, port)로 변환"""
+    if not url.startswith('local://'):
+        raise ValueError(f"로컬 브로커 URL이 아닙니다: {url}")
+    host, _, port = url[len('local://'):].rstrip('/').partition(':')
+    return host or '127.0.0.1', int(port or 6390)
+
+
+def send_frame(sock, payload):
+    """길이 접두사 프레임 전송"""
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            return None
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+def recv_frame(sock):
+    """프레임 하나 수신 (연결이 끊기면 None)"""
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    return _recv_exact(sock, HEADER.unpack(header)[0])
+
+
+class _BrokerHandler(socketserver.BaseRequestHandler):
+    """클라이언트 연결 하나를 처리"""
+
+    def handle(self):
+        role = recv_frame(self.request)
+        if role == ROLE_SUBSCRIBER:
+            self.server.add_subscriber(self.request)
+            # 구독 연결은 끊길 때까지 대기
+            while self.request.recv(1024):
+                pass
+            self.server.remove_subscriber(self.request)
+            return
+
+        while True:
+            frame = recv_frame(self.request)
+            if frame is None:
+                return
+            self.server.broadcast(frame)
+
+
+class LocalBroker(socketserver.ThreadingTCPServer):
+    """구독자 전체에 프레임을 전달하는 fan-out 브로커"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address):
+        super().__init__(address, _BrokerHandler)
+        self.subscribers = {}  # 구독 소켓 -> 전송 잠금 (프레임이 섞이지 않도록 소켓별로 직렬화)
+        self.lock = threading.Lock()
+
+    def add_subscriber(self, sock):
+        with self.lock:
+            self.subscribers[sock] = threading.Lock()
+
+    def remove_subscriber(self, sock):
+        with self.lock:
+            self.subscribers.pop(sock, None)
+
+    def broadcast(self, frame):
+        """모든 구독자에게 프레임 전달 (전송 실패한 구독자는 제거)
+
+        구독자 목록만 잠금 안에서 복사하고 전송은 잠금 밖에서 하므로,
+        느린 구독자 하나가 다른 발행자의 전달이나 구독 추가/제거를 막지 않습니다.
+        """
+        with self.lock:
+            targets = list(self.subscribers.items())
+        for sock, send_lock in targets:
+            try:
+                with send_lock:
+                    send_frame(sock, frame)
+            except OSError:
+                self.remove_subscriber(sock)
+
+
+class LocalBrokerClient:
+    """채널 단위 발행/구독 클라이언트"""
+
+    def __init__(self, url=DEFAULT_URL, channel='default'):
+        self.address = parse_url(url)
+        self.channel = channel
+        self._publisher = None
+        self._lock = threading.Lock()
+
+    def _connect(self, role):
+        sock = socket.create_connection(self.address)
+        send_frame(sock, role)
+        return sock
+
+    def publish(self, data):
+        """메시지 발행 (연결이 끊겼으면 한 번 재연결 후 재전송)"""
+        payload = pickle.dumps((self.channel, data))
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._publisher is None:
+                        self._publisher = self._connect(ROLE_PUBLISHER)
+                    send_frame(self._publisher, payload)
+                    return
+                except OSError:
+                    if self._publisher is not None:
+                        self._publisher.close()
+                    self._publisher = None
+                    if attempt:
+                        raise
+
+    def listen(self):
+        """채널 메시지를 계속 반환하는 제너레이터 (연결이 끊기면 재연결)"""
+        while True:
+            sock = None
+            try:
+                sock = self._connect(ROLE_SUBSCRIBER)
+                while True:
+                    frame = recv_frame(sock)
+                    if frame is None:
+                        break
+                    channel, data = pickle.loads(frame)
+                    if channel == self.channel:
+                        yield data
+            except OSError as e:
+                logging.warning(f"Local broker connection error: {str(e)}")
+            finally:
+                if sock is not None:
+                    sock.close()
+            time.sleep(1)
+
+
+class LocalBrokerManager(socketio.PubSubManager):
+    """로컬 브로커를 사용하는 Socket.IO 클라이언트 매니저 (RedisManager 대체)"""
+
+    name = 'local'
+
+    def __init__(self, url=DEFAULT_URL, channel='flask-socketio', write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.client = LocalBrokerClient(url, channel)
+
+    def _publish(self, data):
+        self.client.publish(data)
+
+    def _listen(self):
+        yield from self.client.listen()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Jungle Tetris 로컬 메시지 브로커')
+    parser.add_argument('--host', default='127.0.0.1', help='바인드 주소')
+    parser.add_argument('--port', type=int, default=6390, help='포트')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with LocalBroker((args.host, args.port)) as broker:
+        logging.info(f"📮 Local broker listening on local://{args.host}:{args.port}")
+        try:
+            broker.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+대전 종료 커밋 파이프라인
+모든 참가자가 게임을 마치면 game:end를 먼저 브로드캐스트하고,
+방 종료/게임 기록/사용자 통계 저장은 한 단계로 모아 bulk_write 위주로 처리합니다.
+MATCH_COMMIT_ASYNC가 켜져 있으면 요청 greenlet 밖의 백그라운드 작업에서 실행합니다.
+"""
+import logging
+import threading
+import time
+
+from app.models.game_record import GameRecord
+from app.models.user import User
+
+
+class MatchCommit:
+    """대전 한 판의 종료 시점 저장 묶음"""
+
+    def __init__(self, room, scores, winner_id, is_draw, duration=60):
+        self.room = room
+        self.scores = scores
+        self.winner_id = winner_id
+        self.is_draw = is_draw
+        self.duration = duration
+        self.attempts = 0
+        self.done = set()  # 완료된 저장 단계
+        self.record = None  # 재시도 간 같은 game_id를 쓰도록 한 번만 생성
+
+    def players_data(self):
+        return [
+            {'user_id': p['user_id'], 'name': p['name'], 'score': p.get('score', 0)}
+            for p in self.room.participants
+        ]
+
+    def stats_results(self):
+        return [
+            (p['user_id'], not self.is_draw and p['user_id'] == self.winner_id, p.get('score', 0))
+            for p in self.room.participants
+        ]
+
+    def run(self):
+        """방 종료 -> 게임 기록(+기간별 리더보드) -> 사용자 통계 -> 랭킹 순으로 저장
+
+        재시도 시 이미 끝난 단계는 건너뛰어 기록/승리가 중복 반영되지 않도록 합니다.
+        """
+        if 'room' not in self.done:
+            self.room.end_game(self.scores)
+            self.done.add('room')
+        if 'record' not in self.done:
+            if self.record is None:
+                self.record = GameRecord.new_multiplayer_record(
+                    self.room.room_id, self.players_data(), self.winner_id, self.duration
+                )
+            self.record.submit(self.room.replays)
+            self.done.add('record')
+        if 'stats' not in self.done:
+            User.bulk_update_stats(self.stats_results())
+            self.done.add('stats')
+        if 'rankings' not in self.done:
+            User.refresh_rankings([p['user_id'] for p in self.room.participants])
+            self.done.add('rankings')
+
+
+class MatchCommitter:
+    """대전 종료 저장을 요청 경로 밖에서 실행"""
+
+    def __init__(self):
+        self.socketio = None
+        self.async_commit = True
+        self.max_attempts = 3
+        self.retry_delay = 1.0
+        self._pending = 0
+        self._lock = threading.Lock()
+        # 관측용 카운터
+        self.commit_count = 0
+        self.retry_count = 0
+        self.error_count = 0
+        self.last_commit_duration = 0.0
+
+    def init_app(self, app, socketio):
+        """앱 설정으로 초기화"""
+        self.socketio = socketio
+        self.async_commit = app.config.get('MATCH_COMMIT_ASYNC', True)
+        self.max_attempts = app.config.get('MATCH_COMMIT_MAX_ATTEMPTS', 3)
+
+    def submit(self, commit):
+        """종료 저장 예약 (비동기 비활성화 시 즉시 실행)"""
+        with self._lock:
+            self._pending += 1
+        if self.async_commit and self.socketio is not None:
+            self.socketio.start_background_task(self._run, commit)
+        else:
+            self._run(commit)
+
+    def _run(self, commit):
+        try:
+            while True:
+                commit.attempts += 1
+                started = time.time()
+                try:
+                    commit.run()
+                except Exception as e:
+                    if commit.attempts >= self.max_attempts:
+                        self.error_count += 1
+                        logging.error(f"Match commit failed for room {commit.room.room_id}: {str(e)}")
+                        return False
+                    self.retry_count += 1
+                    logging.warning(f"Match commit retry for room {commit.room.room_id}: {str(e)}")
+                    self._sleep(self.retry_delay * commit.attempts)
+                    continue
+                self.commit_count += 1
+                self.last_commit_duration = time.time() - started
+                return True
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _sleep(self, seconds):
+        if self.socketio is not None:
+            self.socketio.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def stats(self):
+        """커밋 카운터"""
+        return {
+            'pending': self._pending,
+            'commits': self.commit_count,
+            'retries': self.retry_count,
+            'errors': self.error_count,
+            'last_commit_duration': round(self.last_commit_duration, 4)
+        }
+
+
+# 대전 종료 커밋 인스턴스 (전역)
+match_committer = MatchCommitter()
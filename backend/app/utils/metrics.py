@@ -0,0 +1,220 @@
+"""
+프로세스 메트릭 수집 및 Prometheus 텍스트 형식 출력
+카운터/게이지/히스토그램을 라벨별 자식 객체로 보관하고, /metrics 요청 시
+등록된 수집 함수(collector)를 호출해 현재 값을 함께 출력합니다.
+자주 갱신하는 쪽은 labels()로 자식을 미리 받아 두고 락 없이 속성만 갱신합니다.
+"""
+import bisect
+import threading
+
+# 기본 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels):
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(key, extra=None):
+    items = list(key) + list(extra or [])
+    if not items:
+        return ''
+    body = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for name, value in items
+    )
+    return '{' + body + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Value:
+    """라벨 값 하나에 묶인 카운터/게이지 값
+
+    labels()로 미리 받아 두면 갱신은 속성 덧셈/대입 한 번으로 끝납니다 (락, 라벨 튜플 할당 없음).
+    갱신은 모두 hub 스레드의 greenlet에서 일어나므로 덧셈 도중에 다른 갱신이 끼어들지 않습니다.
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+
+class _Series:
+    """라벨 값 하나에 묶인 히스토그램 버킷 (갱신 규칙은 _Value와 동일)"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Metric:
+    """라벨 값별 자식을 보관하는 메트릭 (자식 생성 시에만 락 사용)"""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._children = {}  # label key -> 자식
+        self._unlabeled = None
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        """라벨 값에 묶인 자식 반환 (자주 갱신하는 쪽은 미리 받아 두고 재사용)"""
+        if not labels and self._unlabeled is not None:
+            return self._unlabeled
+        key = _label_key(labels)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        if not labels:
+            self._unlabeled = child
+        return child
+
+
+class Counter(_Metric):
+    """증가만 하는 카운터"""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1, **labels):
+        self.labels(**labels).value += amount
+
+    def value(self, **labels):
+        child = self._children.get(_label_key(labels))
+        return child.value if child is not None else 0
+
+    def samples(self):
+        return [(self.name, key, child.value) for key, child in list(self._children.items())]
+
+
+class Gauge(Counter):
+    """임의로 설정 가능한 게이지"""
+
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        self.labels(**labels).value = value
+
+    def dec(self, amount=1, **labels):
+        self.labels(**labels).value -= amount
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _Series(self.buckets)
+
+    def observe(self, value, **labels):
+        self.labels(**labels).observe(value)
+
+    def snapshot(self, **labels):
+        """라벨의 (합계, 개수)"""
+        series = self._children.get(_label_key(labels))
+        if series is None:
+            return 0.0, 0
+        return series.sum, series.count
+
+    def samples(self):
+        samples = []
+        for key, series in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series.counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", key + (('le', _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", key, series.sum))
+            samples.append((f"{self.name}_count", key, series.count))
+        return samples
+
+
+class MetricsRegistry:
+    """메트릭 보관소"""
+
+    def __init__(self, prefix='jungle_tetris_'):
+        self.prefix = prefix
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, *args):
+        name = self.prefix + name
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, *args)
+            return metric
+
+    def counter(self, name, help_text):
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name, help_text):
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, buckets)
+
+    def register(self, metric):
+        """직접 구현한 메트릭 등록 (name, help, kind, samples()를 제공하는 객체)"""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector):
+        """출력 직전에 호출할 수집 함수 등록 (게이지 갱신 용도)"""
+        self._collectors.append(collector)
+
+    def render(self):
+        """Prometheus 텍스트 형식 출력"""
+        for collector in list(self._collectors):
+            collector()
+
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample_name, key, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(key)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+# 메트릭 인스턴스 (전역)
+metrics = MetricsRegistry()
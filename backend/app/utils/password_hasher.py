@@ -0,0 +1,117 @@
+"""
+비밀번호 해싱 (이벤트 루프 밖에서 실행)
+bcrypt 해싱/검증은 수십 ms의 CPU 작업이므로, eventlet 환경에서는 tpool 네이티브
+스레드로 넘겨 다른 소켓이 멈추지 않도록 합니다. 동시 실행 수는 세마포어로 제한합니다.
+기존 Werkzeug 해시도 검증할 수 있으며, 로그인 성공 시 bcrypt로 다시 해싱합니다.
+"""
+import threading
+import time
+
+import bcrypt
+
+try:
+    from werkzeug.security import check_password_hash
+except ImportError:
+    # 대체 구현
+    import hashlib
+
+    def check_password_hash(hashed, password):
+        return hashed == hashlib.sha256(password.encode()).hexdigest()
+
+from app.utils.metrics import metrics
+
+BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+OPS = ('hash', 'verify', 'verify_legacy')  # 메트릭 라벨로 쓰는 작업 종류
+
+
+class PasswordHasherBusy(Exception):
+    """해싱 대기열이 가득 찬 경우"""
+
+
+def _offload(func, *args):
+    """eventlet monkey patch 환경이면 tpool 스레드에서, 아니면 그대로 실행"""
+    try:
+        from eventlet import patcher, tpool
+    except ImportError:
+        return func(*args)
+    if patcher.is_monkey_patched('thread'):
+        return tpool.execute(func, *args)
+    return func(*args)
+
+
+def _bcrypt_hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('ascii')
+
+
+def _bcrypt_check(hashed, password):
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('ascii'))
+
+
+class PasswordHasher:
+    """동시 실행 수가 제한된 bcrypt 해셔"""
+
+    def __init__(self):
+        self.rounds = 12
+        self.queue_timeout = 5.0
+        self._slots = threading.BoundedSemaphore(4)
+        # 작업 종류(op)별 자식을 미리 받아 두고 요청마다 속성만 갱신
+        self.waiters = metrics.gauge('password_hash_waiters', 'Password hash operations waiting for a worker slot').labels()
+        duration = metrics.histogram(
+            'password_hash_seconds', 'Password hash and verify duration including queueing'
+        )
+        rejected = metrics.counter('password_hash_rejected_total', 'Password hash operations rejected as busy')
+        self.duration = {op: duration.labels(op=op) for op in OPS}
+        self.rejected = {op: rejected.labels(op=op) for op in OPS}
+
+    def init_app(self, app):
+        """앱 설정으로 초기화"""
+        self.configure(
+            app.config.get('BCRYPT_LOG_ROUNDS', 12),
+            app.config.get('PASSWORD_HASH_CONCURRENCY', 4),
+            app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5.0)
+        )
+
+    def configure(self, rounds, concurrency, queue_timeout):
+        """라운드 수, 동시 실행 수, 대기 제한 시간 설정"""
+        self.rounds = rounds
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(concurrency)
+
+    def _run(self, op, func, *args):
+        started = time.perf_counter()
+        self.waiters.inc()
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        self.waiters.dec()
+        if not acquired:
+            self.rejected[op].inc()
+            raise PasswordHasherBusy('비밀번호 처리 요청이 많습니다')
+        try:
+            return _offload(func, *args)
+        finally:
+            self._slots.release()
+            self.duration[op].observe(time.perf_counter() - started)
+
+    def hash(self, password):
+        """bcrypt 해시 생성 (BCRYPT_LOG_ROUNDS)"""
+        return self._run('hash', _bcrypt_hash, password, self.rounds)
+
+    def verify(self, hashed, password):
+        """비밀번호 확인 (bcrypt 및 기존 Werkzeug 해시 지원)"""
+        if not hashed or not password:
+            return False
+        if hashed.startswith(BCRYPT_PREFIXES):
+            return self._run('verify', _bcrypt_check, hashed, password)
+        return self._run('verify_legacy', check_password_hash, hashed, password)
+
+    def needs_rehash(self, hashed):
+        """기존 방식 해시이거나 라운드 수가 설정과 다르면 True"""
+        if not hashed or not hashed.startswith(BCRYPT_PREFIXES):
+            return True
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+# 비밀번호 해셔 인스턴스 (전역)
+password_hasher = PasswordHasher()
@@ -0,0 +1,114 @@
+"""
+실행 중인 워커용 샘플링 프로파일러
+네이티브 스레드가 일정 주기(hz)로 hub 스레드의 현재 프레임을 읽어 스택별 횟수를 세고,
+flamegraph.pl / speedscope에서 바로 읽을 수 있는 collapsed stack 형식으로 반환합니다.
+eventlet에서는 모든 greenlet이 hub 스레드 하나에서 실행되므로 이 스레드만 샘플링하면
+라우트와 소켓 핸들러 전체가 포함되며, 스택 맨 앞에는 처리 중이던 핸들러/라우트를 붙입니다.
+"""
+import os
+import sys
+
+from eventlet import patcher
+
+from app.utils.stall_detector import find_activity
+
+_native_threading = patcher.original('threading')
+_native_thread = patcher.original('_thread')
+_native_time = patcher.original('time')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# hub가 다음 이벤트를 기다리는 중인 프레임 (유휴 샘플)
+IDLE_MARKER = os.sep + os.path.join('eventlet', 'hubs') + os.sep
+
+
+class ProfilerBusy(Exception):
+    """다른 프로파일링이 진행 중인 경우"""
+
+
+def _short_path(filename):
+    if filename.startswith(PROJECT_ROOT):
+        return os.path.relpath(filename, PROJECT_ROOT)
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+class SamplingProfiler:
+    """hub 스레드 스택 샘플러"""
+
+    def __init__(self):
+        self._running = False
+        self._stop = False
+        self._done = False
+        self._counts = {}
+        self._labels = {}  # code 객체 -> 프레임 이름
+        self.samples = 0
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _sample(self, thread_id, include_idle):
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            return
+        if not include_idle and IDLE_MARKER in frame.f_code.co_filename:
+            return
+        stack = []
+        activity = find_activity(frame)
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        if activity:
+            stack.append(f"[{activity}]")
+        key = ';'.join(reversed(stack))
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self.samples += 1
+
+    def _run(self, thread_id, interval, include_idle):
+        try:
+            while not self._stop:
+                self._sample(thread_id, include_idle)
+                _native_time.sleep(interval)
+        finally:
+            self._done = True
+
+    def profile(self, seconds, hz=100, include_idle=False, sleep=None):
+        """seconds 동안 hz 주기로 샘플링 후 collapsed stack 문자열 반환
+
+        호출한 greenlet이 실행 중인 스레드(hub 스레드)를 샘플링하며,
+        기다리는 동안에는 sleep(eventlet/socketio sleep)으로 양보합니다.
+        """
+        if self._running:
+            raise ProfilerBusy('이미 프로파일링이 진행 중입니다')
+        sleep = sleep or _native_time.sleep
+        self._running = True
+        self._stop = False
+        self._done = False
+        self._counts = {}
+        self.samples = 0
+        try:
+            thread_id = _native_thread.get_ident()
+            _native_threading.Thread(
+                target=self._run, args=(thread_id, 1.0 / hz, include_idle),
+                name='sampling-profiler', daemon=True
+            ).start()
+            sleep(seconds)
+            self._stop = True
+            while not self._done:
+                sleep(0.01)
+            lines = [f"{stack} {count}" for stack, count in sorted(self._counts.items())]
+            return '\n'.join(lines) + ('\n' if lines else '')
+        finally:
+            self._running = False
+
+    @property
+    def running(self):
+        return self._running
+
+
+# 샘플링 프로파일러 인스턴스 (전역)
+sampling_profiler = SamplingProfiler()
@@ -0,0 +1,50 @@
+"""
+워커 간 발행/구독 백엔드
+SOCKETIO_MESSAGE_QUEUE URL에 따라 Socket.IO 클라이언트 매니저와
+방 상태 동기화용 채널을 생성합니다.
+
+    local://host:port  -> 로컬 브로커 (app.utils.local_broker)
+    redis://...        -> Redis (redis 패키지 필요)
+"""
+import pickle
+
+
+class RedisPubSub:
+    """Redis 기반 채널 발행/구독 클라이언트"""
+
+    def __init__(self, url, channel):
+        import redis
+        self.redis = redis.Redis.from_url(url)
+        self.channel = channel
+
+    def publish(self, data):
+        """메시지 발행"""
+        self.redis.publish(self.channel, pickle.dumps(data))
+
+    def listen(self):
+        """채널 메시지를 계속 반환하는 제너레이터"""
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        for message in pubsub.listen():
+            if message.get('type') == 'message':
+                yield pickle.loads(message['data'])
+
+
+def create_pubsub(url, channel):
+    """URL에 맞는 발행/구독 클라이언트 생성"""
+    if url.startswith('local://'):
+        from app.utils.local_broker import LocalBrokerClient
+        return LocalBrokerClient(url, channel)
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisPubSub(url, channel)
+    raise ValueError(f"지원하지 않는 메시지 큐 URL입니다: {url}")
+
+
+def socketio_queue_options(url):
+    """Flask-SocketIO init_app에 전달할 메시지 큐 옵션"""
+    if not url:
+        return {}
+    if url.startswith('local://'):
+        from app.utils.local_broker import LocalBrokerManager
+        return {'client_manager': LocalBrokerManager(url)}
+    return {'message_queue': url}
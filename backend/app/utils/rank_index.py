@@ -0,0 +1,189 @@
+"""
+내 순위 조회용 순서 통계 인덱스
+점수/승리 값을 버킷으로 나눠 버킷별 사용자 수를 Fenwick 트리로 관리하여
+임의 사용자의 순위와 백분위를 O(log n)에 계산합니다.
+이 워커의 통계 갱신은 즉시 반영하고, 다른 워커의 갱신은 RANK_INDEX_REBUILD_INTERVAL마다
+DB에서 다시 생성하여 보정합니다. 재생성은 백그라운드 작업에서 수행하여 새 인덱스로
+한 번에 교체하며, 그동안 조회는 기존 인덱스를 사용합니다.
+"""
+import logging
+import threading
+import time
+
+from app.utils.database import get_db
+
+
+class FenwickTree:
+    """구간 합 트리 (Binary Indexed Tree)"""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        """index 위치에 delta 더하기 (0부터 시작)"""
+        index += 1
+        while index <= self.size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        """0 ~ index 위치의 합"""
+        index += 1
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+
+class RankIndex:
+    """값 분포 인덱스 (같은 버킷 안의 값은 동순위)"""
+
+    def __init__(self, bucket_size, max_value):
+        self.bucket_size = bucket_size
+        self.buckets = max_value // bucket_size + 1
+        self.tree = FenwickTree(self.buckets)
+        self.total = 0
+
+    def _bucket(self, value):
+        return min(max(value, 0) // self.bucket_size, self.buckets - 1)
+
+    def add(self, value):
+        self.tree.add(self._bucket(value), 1)
+        self.total += 1
+
+    def remove(self, value):
+        self.tree.add(self._bucket(value), -1)
+        self.total -= 1
+
+    def count_greater(self, value):
+        """value보다 높은 버킷의 사용자 수"""
+        return self.total - self.tree.prefix_sum(self._bucket(value))
+
+    def rank(self, value):
+        """순위 (1부터)"""
+        return self.count_greater(value) + 1
+
+    def percentile(self, value):
+        """상위 백분위 (예: 3.5 -> 상위 3.5%)"""
+        if not self.total:
+            return 100.0
+        return round(self.rank(value) / self.total * 100, 2)
+
+
+class UserRankIndex:
+    """전체 사용자의 점수/승리 순위 인덱스"""
+
+    def __init__(self):
+        self.socketio = None
+        self.score_bucket = 10
+        self.score_max = 1000000
+        self.wins_max = 100000
+        self.rebuild_interval = 300
+        self._built_at = 0
+        self._rebuilding = False
+        self.scores = None
+        self.wins = None
+        self._values = {}  # user_id -> (solo_high_score, wins)
+        self._changed = None  # 재생성 중 반영된 갱신 (교체 후 새 인덱스에 다시 적용)
+        self._lock = threading.Lock()
+
+    def init_app(self, app, socketio=None):
+        """앱 설정으로 초기화 (인덱스는 첫 조회 시 생성)"""
+        self.socketio = socketio
+        self.score_bucket = app.config.get('RANK_SCORE_BUCKET', 10)
+        self.score_max = app.config.get('RANK_SCORE_MAX', 1000000)
+        self.wins_max = app.config.get('RANK_WINS_MAX', 100000)
+        self.rebuild_interval = app.config.get('RANK_INDEX_REBUILD_INTERVAL', 300)
+
+    def build(self):
+        """users 컬렉션 전체로 새 인덱스를 만든 뒤 기존 인덱스와 교체"""
+        with self._lock:
+            self._changed = {}
+        db = get_db()
+        scores = RankIndex(self.score_bucket, self.score_max)
+        wins = RankIndex(1, self.wins_max)
+        values = {}
+        for doc in db.users.find({}, {'user_id': 1, 'solo_high_score': 1, 'wins': 1}):
+            value = (doc.get('solo_high_score', 0) or 0, doc.get('wins', 0) or 0)
+            values[doc.get('user_id')] = value
+            scores.add(value[0])
+            wins.add(value[1])
+
+        with self._lock:
+            # 재생성 중에 반영된 갱신은 DB 스캔에 빠졌을 수 있으므로 새 인덱스에 다시 적용
+            for user_id, value in self._changed.items():
+                previous = values.get(user_id)
+                if previous is not None:
+                    scores.remove(previous[0])
+                    wins.remove(previous[1])
+                scores.add(value[0])
+                wins.add(value[1])
+                values[user_id] = value
+            self._changed = None
+            self.scores, self.wins, self._values = scores, wins, values
+            self._built_at = time.time()
+
+    def _ensure_built(self):
+        if self.scores is None:
+            # 첫 생성은 사용할 인덱스가 없으므로 요청에서 직접 수행
+            self.build()
+        elif time.time() - self._built_at >= self.rebuild_interval and not self._rebuilding:
+            # 재생성은 하나만 백그라운드에서 수행하고, 끝날 때까지 기존 인덱스를 사용
+            self._rebuilding = True
+            if self.socketio is not None:
+                self.socketio.start_background_task(self._rebuild)
+            else:
+                self._rebuild()
+
+    def _rebuild(self):
+        try:
+            self.build()
+        except Exception as e:
+            logging.error(f"Rank index rebuild error: {str(e)}")
+        finally:
+            with self._lock:
+                self._changed = None
+            self._rebuilding = False
+
+    def on_user_updated(self, user):
+        """사용자 통계 변경 반영 (신규 사용자는 추가)"""
+        if self.scores is None:
+            return
+        value = (user.solo_high_score or 0, user.wins or 0)
+        with self._lock:
+            previous = self._values.get(user.user_id)
+            if previous == value:
+                return
+            if previous is not None:
+                self.scores.remove(previous[0])
+                self.wins.remove(previous[1])
+            self.scores.add(value[0])
+            self.wins.add(value[1])
+            self._values[user.user_id] = value
+            if self._changed is not None:
+                self._changed[user.user_id] = value
+
+    def lookup(self, user):
+        """사용자의 점수/승리 순위와 백분위"""
+        self._ensure_built()
+        self.on_user_updated(user)
+        return {
+            'score': {
+                'value': user.solo_high_score,
+                'rank': self.scores.rank(user.solo_high_score),
+                'percentile': self.scores.percentile(user.solo_high_score),
+                'total': self.scores.total
+            },
+            'wins': {
+                'value': user.wins,
+                'rank': self.wins.rank(user.wins),
+                'percentile': self.wins.percentile(user.wins),
+                'total': self.wins.total
+            }
+        }
+
+
+# 순위 인덱스 인스턴스 (전역)
+user_rank_index = UserRankIndex()
@@ -0,0 +1,108 @@
+"""
+랭킹 Top-K 캐시
+점수(solo_high_score)와 승리(wins) 기준 상위 사용자를 메모리에 보관하여
+랭킹 페이지와 랭킹 API가 요청마다 집계 쿼리를 실행하지 않도록 합니다.
+User.update_stats에서 즉시 갱신되고, 일정 주기마다 DB에서 다시 읽어 보정합니다.
+"""
+import threading
+import time
+from datetime import datetime
+
+from app.utils.database import get_db
+
+RANKING_FIELDS = {'user_id': 1, 'name': 1, 'solo_high_score': 1, 'wins': 1, 'created_at': 1}
+
+
+def _entry(doc):
+    """사용자 문서에서 랭킹 항목 생성"""
+    return {
+        'user_id': doc.get('user_id'),
+        'name': doc.get('name'),
+        'solo_high_score': doc.get('solo_high_score', 0) or 0,
+        'wins': doc.get('wins', 0) or 0,
+        'created_at': doc.get('created_at')
+    }
+
+
+def _score_key(entry):
+    return (-entry['solo_high_score'], entry['created_at'] or datetime.min)
+
+
+def _wins_key(entry):
+    return (-entry['wins'], entry['created_at'] or datetime.min)
+
+
+class RankingCache:
+    """점수/승리 랭킹 상위 K명 캐시"""
+
+    def __init__(self):
+        self.limit = 100
+        self.refresh_interval = 60
+        self._scores = []
+        self._wins = []
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """앱 설정으로 초기화"""
+        self.limit = app.config.get('MAX_RANKING_LIMIT', 100)
+        self.refresh_interval = app.config.get('RANKING_REFRESH_INTERVAL', 60)
+
+    def refresh(self):
+        """DB에서 상위 K명 다시 조회"""
+        db = get_db()
+        scores = [_entry(doc) for doc in db.users.find(
+            {'solo_high_score': {'$gt': 0}}, RANKING_FIELDS
+        ).sort([('solo_high_score', -1), ('created_at', 1)]).limit(self.limit)]
+        wins = [_entry(doc) for doc in db.users.find(
+            {'wins': {'$gt': 0}}, RANKING_FIELDS
+        ).sort([('wins', -1), ('created_at', 1)]).limit(self.limit)]
+
+        with self._lock:
+            self._scores = scores
+            self._wins = wins
+            self._loaded_at = time.time()
+
+    def _ensure_fresh(self):
+        if time.time() - self._loaded_at >= self.refresh_interval:
+            self.refresh()
+
+    def _clamp(self, limit):
+        """요청 개수를 1 ~ self.limit 범위로 제한 (None이면 전체)"""
+        if limit is None:
+            return self.limit
+        return max(1, min(limit, self.limit))
+
+    def top_scores(self, limit=None):
+        """점수 랭킹 상위 목록"""
+        self._ensure_fresh()
+        return [dict(entry) for entry in self._scores[:self._clamp(limit)]]
+
+    def top_wins(self, limit=None):
+        """승리 랭킹 상위 목록"""
+        self._ensure_fresh()
+        return [dict(entry) for entry in self._wins[:self._clamp(limit)]]
+
+    def _upsert(self, ranking, entry, field, key):
+        ranking = [e for e in ranking if e['user_id'] != entry['user_id']]
+        if entry[field] <= 0:
+            return ranking
+        # 목록이 가득 찼고 마지막 항목보다 낮으면 진입하지 않음
+        if len(ranking) >= self.limit and key(entry) >= key(ranking[-1]):
+            return ranking
+        ranking.append(entry)
+        ranking.sort(key=key)
+        return ranking[:self.limit]
+
+    def on_user_updated(self, user):
+        """사용자 통계 변경 반영"""
+        if not self._loaded_at:
+            return
+        entry = _entry(user.to_dict())
+        with self._lock:
+            self._scores = self._upsert(self._scores, entry, 'solo_high_score', _score_key)
+            self._wins = self._upsert(self._wins, entry, 'wins', _wins_key)
+
+
+# 랭킹 캐시 인스턴스 (전역)
+ranking_cache = RankingCache()
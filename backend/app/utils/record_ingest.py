@@ -0,0 +1,233 @@
+"""
+게임 기록 일괄 저장 대기열
+끝난 게임 기록을 메모리에 모았다가 개수(RECORD_INGEST_BATCH_SIZE) 또는
+시간(RECORD_INGEST_INTERVAL) 기준으로 insert_many(ordered=False) 한 번에 저장하고,
+기간별 리더보드도 같은 묶음으로 갱신합니다.
+실패한 기록만 대기열 뒤로 돌려 재시도하고, RECORD_INGEST_MAX_ATTEMPTS번 실패하면
+game_records_dead 컬렉션으로 옮겨 뒤따르는 기록을 막지 않도록 합니다.
+대기열이 가득 차면(RECORD_INGEST_MAX_PENDING) 호출한 쪽이 직접 flush하며,
+그래도 비우지 못하면 예외를 발생시켜 요청을 거절합니다.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError
+from app.models.leaderboard import PeriodLeaderboard
+from app.utils.database import get_db
+
+DUPLICATE_KEY = 11000
+
+
+class RecordQueueFull(Exception):
+    """기록 대기열이 가득 차 저장할 수 없는 경우"""
+
+
+class PendingRecord:
+    """대기 중인 기록과 저장 진행 상태"""
+
+    __slots__ = ('record', 'attempts', 'inserted', 'error')
+
+    def __init__(self, record):
+        self.record = record
+        self.attempts = 0
+        self.inserted = False  # game_records 저장 완료 (리더보드만 남은 상태)
+        self.error = None
+
+
+class RecordIngestQueue:
+    """게임 기록 일괄 저장 대기열"""
+
+    def __init__(self):
+        self.socketio = None
+        self.batch_size = 100
+        self.interval = 1.0
+        self.max_pending = 5000
+        self.max_attempts = 5
+        self.sync = False
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task = None
+        self._flush_scheduled = False
+        # 관측용 카운터
+        self.batch_count = 0
+        self.write_count = 0
+        self.duplicate_count = 0
+        self.error_count = 0
+        self.retry_count = 0
+        self.dead_letter_count = 0
+        self.backpressure_count = 0
+        self.last_flush_at = None
+        self.last_flush_duration = 0.0
+
+    def init_app(self, app, socketio):
+        """앱 설정으로 초기화"""
+        self.socketio = socketio
+        self.batch_size = app.config.get('RECORD_INGEST_BATCH_SIZE', 100)
+        self.interval = app.config.get('RECORD_INGEST_INTERVAL', 1.0)
+        self.max_pending = app.config.get('RECORD_INGEST_MAX_PENDING', 5000)
+        self.max_attempts = app.config.get('RECORD_INGEST_MAX_ATTEMPTS', 5)
+        self.sync = app.config.get('RECORD_INGEST_SYNC', False)
+
+    def submit(self, record):
+        """기록을 대기열에 추가 (sync 설정 시 즉시 저장)"""
+        record.ensure_game_id()
+        entry = PendingRecord(record)
+        if self.sync or self.socketio is None:
+            failed = self._write([entry])
+            if failed:
+                raise failed[0].error
+            return
+
+        if len(self._buffer) >= self.max_pending:
+            # 백프레셔: 호출한 쪽이 직접 저장하고, 그래도 가득 차 있으면 거절
+            self.backpressure_count += 1
+            self.flush()
+            if len(self._buffer) >= self.max_pending:
+                raise RecordQueueFull('게임 기록 대기열이 가득 찼습니다')
+
+        with self._lock:
+            self._buffer.append(entry)
+            full_batch = len(self._buffer) >= self.batch_size and not self._flush_scheduled
+            if full_batch:
+                self._flush_scheduled = True
+        if full_batch:
+            self.socketio.start_background_task(self.flush)
+        self._ensure_started()
+
+    def flush(self):
+        """flush 시작 시점에 대기 중이던 기록을 batch_size 단위로 저장
+
+        실패한 기록은 시도 횟수를 늘려 대기열 뒤로 돌리고(다음 flush에서 재시도),
+        max_attempts에 도달하면 dead letter로 옮깁니다.
+        """
+        written = 0
+        with self._flush_lock:
+            self._flush_scheduled = False
+            remaining = len(self._buffer)
+            while remaining > 0:
+                with self._lock:
+                    batch = self._buffer[:min(self.batch_size, remaining)]
+                    del self._buffer[:len(batch)]
+                if not batch:
+                    break
+                remaining -= len(batch)
+                started = time.time()
+                try:
+                    failed = self._write(batch)
+                except Exception as e:
+                    # 연결 오류 등 묶음 전체 실패: 이번 flush는 중단하고 다음 주기에 재시도
+                    self.error_count += 1
+                    logging.error(f"Game record ingest flush error: {str(e)}")
+                    for entry in batch:
+                        entry.error = e
+                    self._retry_or_dead_letter(batch)
+                    break
+                self._retry_or_dead_letter(failed)
+                written += len(batch) - len(failed)
+                self.last_flush_at = time.time()
+                self.last_flush_duration = self.last_flush_at - started
+        return written
+
+    def _write(self, entries):
+        """기록 insert_many 후 저장된 기록만 기간별 리더보드에 일괄 반영, 실패한 항목 목록 반환"""
+        db = get_db()
+        failed = []
+        to_insert = [entry for entry in entries if not entry.inserted]
+        ready = [entry for entry in entries if entry.inserted]
+        if to_insert:
+            try:
+                db.game_records.insert_many([entry.record.to_mongodb_doc() for entry in to_insert], ordered=False)
+                ready.extend(to_insert)
+            except BulkWriteError as e:
+                errors = {error.get('index'): error for error in e.details.get('writeErrors', [])}
+                for index, entry in enumerate(to_insert):
+                    error = errors.get(index)
+                    if error is None:
+                        ready.append(entry)
+                    elif error.get('code') == DUPLICATE_KEY:
+                        # 처음부터 중복이면 다른 제출이 저장/반영한 기록, 재시도 중 중복이면 응답만 못 받은 이번 대기열의 저장
+                        self.duplicate_count += 1
+                        if entry.attempts > 0:
+                            ready.append(entry)
+                    else:
+                        entry.error = Exception(error.get('errmsg', 'write error'))
+                        failed.append(entry)
+        for entry in ready:
+            entry.inserted = True
+
+        if ready:
+            try:
+                # 버킷마다 반영한 game_id를 남기므로 재시도해도 같은 게임은 한 번만 반영
+                PeriodLeaderboard.record_games([entry.record for entry in ready])
+            except Exception as e:
+                for entry in ready:
+                    entry.error = e
+                failed.extend(ready)
+        if len(failed) < len(entries):
+            self.batch_count += 1
+            self.write_count += len(entries) - len(failed)
+        return failed
+
+    def _retry_or_dead_letter(self, entries):
+        retry = []
+        for entry in entries:
+            entry.attempts += 1
+            if entry.attempts >= self.max_attempts:
+                self._dead_letter(entry)
+            else:
+                retry.append(entry)
+        if retry:
+            self.retry_count += len(retry)
+            with self._lock:
+                self._buffer.extend(retry)
+
+    def _dead_letter(self, entry):
+        """재시도 한도를 넘은 기록을 game_records_dead로 이동 (실패 단계와 오류 포함)"""
+        self.dead_letter_count += 1
+        record = entry.record
+        logging.error(f"Game record {record.game_id} moved to dead letter: {str(entry.error)}")
+        try:
+            get_db().game_records_dead.update_one(
+                {'_id': record.game_id},
+                {'$set': {
+                    'record': record.to_mongodb_doc(),
+                    'stage': 'leaderboard' if entry.inserted else 'insert',
+                    'error': str(entry.error),
+                    'attempts': entry.attempts,
+                    'failed_at': datetime.utcnow()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logging.error(f"Game record dead letter write failed for {record.game_id}: {str(e)} ({record.to_mongodb_doc()})")
+
+    def stats(self):
+        """대기열 카운터"""
+        return {
+            'pending': len(self._buffer),
+            'batches': self.batch_count,
+            'writes': self.write_count,
+            'duplicates': self.duplicate_count,
+            'errors': self.error_count,
+            'retries': self.retry_count,
+            'dead_letters': self.dead_letter_count,
+            'backpressure': self.backpressure_count,
+            'last_flush_at': self.last_flush_at,
+            'last_flush_duration': round(self.last_flush_duration, 4)
+        }
+
+    def _ensure_started(self):
+        if self._task is None and self.socketio is not None:
+            self._task = self.socketio.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.interval)
+            self.flush()
+
+
+# 게임 기록 대기열 인스턴스 (전역)
+record_ingest = RecordIngestQueue()
@@ -0,0 +1,122 @@
+"""
+최종 점수 리플레이 검증
+입력 로그 재시뮬레이션은 CPU를 많이 사용하므로 별도 프로세스 풀에서 실행하고,
+요청 처리 쪽은 협력적으로 대기하여 eventlet 허브를 막지 않습니다.
+"""
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from app.engine.simulate import simulate_input_log
+
+# 검증 결과
+VERIFIED = 'verified'
+MISMATCH = 'mismatch'
+INVALID = 'invalid'
+SKIPPED = 'skipped'  # 풀 포화/시간 초과로 fallback 정책 적용
+
+
+class ReplayVerifier:
+    """프로세스 풀 기반 점수 검증기"""
+
+    def __init__(self):
+        self.socketio = None
+        self.executor = None
+        self.workers = 1
+        self.max_pending = 32
+        self.timeout = 2.0
+        self.fallback = 'accept'  # 'accept' | 'reject'
+        self.required = False
+        self.game_time = 60
+        self._pending = 0  # 프로세스 풀에 제출되어 아직 끝나지 않은 검증 수
+        self._lock = threading.Lock()
+        # 관측용 카운터
+        self.counts = {VERIFIED: 0, MISMATCH: 0, INVALID: 0, SKIPPED: 0}
+
+    def init_app(self, app, socketio):
+        """앱 설정으로 초기화 (프로세스 풀은 첫 검증 시 생성)"""
+        self.socketio = socketio
+        self.workers = app.config.get('REPLAY_VERIFY_WORKERS', 1)
+        self.max_pending = app.config.get('REPLAY_VERIFY_MAX_PENDING', 32)
+        self.timeout = app.config.get('REPLAY_VERIFY_TIMEOUT', 2.0)
+        self.fallback = app.config.get('REPLAY_VERIFY_FALLBACK', 'accept')
+        self.required = app.config.get('REPLAY_VERIFY_REQUIRED', False)
+        self.game_time = app.config.get('GAME_TIME_LIMIT', 60)
+
+    def _get_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def _fallback(self, reason):
+        self.counts[SKIPPED] += 1
+        logging.warning(f"Replay verification skipped ({reason}), fallback={self.fallback}")
+        return self.fallback == 'accept', SKIPPED
+
+    def verify(self, input_log, claimed_score, seed=None):
+        """입력 로그로 점수 검증 후 (허용 여부, 결과) 반환
+
+        seed가 주어지면(서버가 발급한 피스 시드) 입력 로그가 반드시 있어야 하고
+        로그의 시드도 같아야 합니다.
+        """
+        if input_log is None:
+            # 입력 로그를 보내지 않는 기존 클라이언트 호환 (서버 시드로 시작한 게임은 제외)
+            if self.required or seed is not None:
+                self.counts[INVALID] += 1
+                return False, INVALID
+            return True, SKIPPED
+        if seed is not None and (not isinstance(input_log, dict) or input_log.get('seed') != seed):
+            self.counts[INVALID] += 1
+            return False, INVALID
+
+        # 대기열이 가득 차면 검증하지 않고 fallback 정책 적용
+        if self._pending >= self.max_pending:
+            return self._fallback('pool saturated')
+
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(simulate_input_log, input_log, self.game_time)
+        except Exception as e:
+            self._release()
+            logging.error(f"Replay verification error: {str(e)}")
+            return self._fallback('error')
+        # 시간 초과로 먼저 응답해도 실행 중인 작업은 취소되지 않으므로 실제로 끝날 때 대기 수 감소
+        future.add_done_callback(self._release)
+
+        try:
+            # 완료 콜백이 깨워줄 때까지 대기 (monkey patch된 Event라 다른 greenlet은 계속 실행됨)
+            done = threading.Event()
+            future.add_done_callback(lambda _: done.set())
+            if not done.wait(self.timeout):
+                future.cancel()
+                return self._fallback('timeout')
+
+            try:
+                simulated_score = future.result()
+            except ValueError:
+                self.counts[INVALID] += 1
+                return False, INVALID
+        except Exception as e:
+            logging.error(f"Replay verification error: {str(e)}")
+            return self._fallback('error')
+
+        if simulated_score != claimed_score:
+            self.counts[MISMATCH] += 1
+            logging.warning(f"Replay score mismatch: claimed={claimed_score}, simulated={simulated_score}")
+            return False, MISMATCH
+
+        self.counts[VERIFIED] += 1
+        return True, VERIFIED
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self):
+        """검증 카운터 및 현재 대기 수"""
+        return dict(self.counts, pending=self._pending)
+
+
+# 리플레이 검증기 인스턴스 (전역)
+replay_verifier = ReplayVerifier()
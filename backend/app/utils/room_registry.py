@@ -0,0 +1,112 @@
+"""
+진행 중인 게임 방의 프로세스 로컬 레지스트리
+게임이 진행되는 동안에는 메모리의 GameRoom이 권한 있는 상태이며,
+MongoDB에는 방 생명주기 경계(생성, 참가, 시작, 종료)에서만 기록합니다.
+"""
+import logging
+import threading
+import time
+import uuid
+
+from app.models.game_room import GameRoom
+
+
+class RoomRegistry:
+    """진행 중인 방 상태를 메모리에 보관하는 레지스트리"""
+
+    def __init__(self):
+        self._rooms = {}
+        self._joined = {}  # room_id -> (참가 API가 반환한 방, 보관 시각)
+        self._lock = threading.RLock()
+        # 다중 워커 동기화 (SOCKETIO_MESSAGE_QUEUE 설정 시)
+        self.pubsub = None
+        self.host_id = uuid.uuid4().hex
+
+    def init_pubsub(self, pubsub, socketio):
+        """워커 간 방 상태 동기화 시작"""
+        self.pubsub = pubsub
+        socketio.start_background_task(self._listen)
+
+    def get(self, room_id):
+        """메모리에 있는 방만 반환 (DB 조회 없음)"""
+        return self._rooms.get(room_id)
+
+    def stage(self, room, ttl=30):
+        """참가 API가 반환한 방 상태 보관 (이어지는 소켓 참가에서 DB 재조회 없이 사용)"""
+        now = time.time()
+        with self._lock:
+            self._joined = {
+                room_id: entry for room_id, entry in self._joined.items()
+                if now - entry[1] < ttl
+            }
+            self._joined[room.room_id] = (room, now)
+
+    def _take_staged(self, room_id, ttl=30):
+        with self._lock:
+            entry = self._joined.pop(room_id, None)
+        if entry and time.time() - entry[1] < ttl:
+            return entry[0]
+        return None
+
+    def load(self, room_id):
+        """메모리에 있으면 그대로, 없으면 DB에서 조회 (진행 중인 방이면 등록)"""
+        room = self._rooms.get(room_id)
+        if room is not None:
+            return room
+
+        room = self._take_staged(room_id) or GameRoom.find_by_room_id(room_id)
+        if room and room.status == 'playing':
+            return self.register(room)
+        return room
+
+    def register(self, room):
+        """방을 레지스트리에 등록 (이미 있으면 기존 객체 반환)"""
+        with self._lock:
+            return self._rooms.setdefault(room.room_id, room)
+
+    def evict(self, room_id):
+        """방을 레지스트리에서 제거"""
+        with self._lock:
+            return self._rooms.pop(room_id, None)
+
+    def update_score(self, room_id, user_id, score):
+        """메모리 상의 참가자 점수만 갱신 (DB 기록 없음, 참가자가 아니면 None)"""
+        room = self.load(room_id)
+        if not room:
+            return None
+        if not room.update_participant_score(user_id, score, persist=False):
+            return None
+        if self.pubsub is not None:
+            self._publish(room_id, user_id, score)
+        return room
+
+    def _publish(self, room_id, user_id, score):
+        """다른 워커에 점수 변경 전달"""
+        try:
+            self.pubsub.publish({
+                'host_id': self.host_id,
+                'room_id': room_id,
+                'user_id': user_id,
+                'score': score
+            })
+        except Exception as e:
+            logging.error(f"Room state publish error: {str(e)}")
+
+    def _listen(self):
+        """다른 워커의 점수 변경을 메모리 상의 방에 반영"""
+        for message in self.pubsub.listen():
+            if message.get('host_id') == self.host_id:
+                continue
+            room = self._rooms.get(message.get('room_id'))
+            if room:
+                room.update_participant_score(message['user_id'], message['score'], persist=False)
+
+    def __contains__(self, room_id):
+        return room_id in self._rooms
+
+    def __len__(self):
+        return len(self._rooms)
+
+
+# 레지스트리 인스턴스 (전역)
+room_registry = RoomRegistry()
@@ -0,0 +1,116 @@
+"""
+게임 중 점수의 write-behind 저장
+게임 중 점수는 메모리에 dirty 상태로 두었다가 주기적으로, 또는
+game:end / room:leave 시점에 한 번의 bulk_write로 MongoDB에 반영합니다.
+"""
+import logging
+import threading
+import time
+
+from app.models.game_room import GameRoom
+
+
+class ScoreWriteBehind:
+    """게임 중 점수 변경을 모아 지연 저장"""
+
+    def __init__(self):
+        self.socketio = None
+        self.interval = 5.0
+        self._dirty = {}  # (room_id, user_id) -> (score, dirty_since)
+        self._lock = threading.Lock()
+        self._task = None
+        # 관측용 카운터
+        self.flush_count = 0
+        self.write_count = 0
+        self.error_count = 0
+        self.last_flush_at = None
+        self.last_flush_duration = 0.0
+
+    def init_app(self, app, socketio):
+        """앱 설정으로 초기화"""
+        self.socketio = socketio
+        self.interval = app.config.get('SCORE_FLUSH_INTERVAL', 5.0)
+
+    def mark(self, room_id, user_id, score):
+        """점수를 dirty 상태로 기록 (같은 참가자는 최신 값만 유지)"""
+        key = (room_id, user_id)
+        with self._lock:
+            previous = self._dirty.get(key)
+            since = previous[1] if previous else time.time()
+            self._dirty[key] = (score, since)
+        self._ensure_started()
+
+    def discard(self, room_id, user_id=None):
+        """dirty 점수 폐기 (최종 결과가 이미 저장된 경우, user_id 지정 시 해당 참가자만)"""
+        with self._lock:
+            if user_id is not None:
+                self._dirty.pop((room_id, user_id), None)
+                return
+            for key in [k for k in self._dirty if k[0] == room_id]:
+                del self._dirty[key]
+
+    def flush(self, room_id=None):
+        """dirty 점수 저장 (room_id 지정 시 해당 방만)"""
+        with self._lock:
+            entries = {
+                key: value for key, value in self._dirty.items()
+                if room_id is None or key[0] == room_id
+            }
+        if not entries:
+            return 0
+
+        started = time.time()
+        try:
+            GameRoom.bulk_update_scores([
+                (key[0], key[1], score) for key, (score, _) in entries.items()
+            ])
+        except Exception as e:
+            # 실패한 항목은 dirty 상태로 남겨 다음 flush에서 재시도
+            self.error_count += 1
+            logging.error(f"Score write-behind flush error: {str(e)}")
+            return 0
+
+        # 저장 도중 더 새로운 점수가 들어온 항목은 dirty 상태 유지
+        with self._lock:
+            for key, value in entries.items():
+                if self._dirty.get(key) is not None and self._dirty[key][0] == value[0]:
+                    del self._dirty[key]
+
+        self.flush_count += 1
+        self.write_count += len(entries)
+        self.last_flush_at = time.time()
+        self.last_flush_duration = self.last_flush_at - started
+        return len(entries)
+
+    def lag(self):
+        """가장 오래된 dirty 점수의 경과 시간 (초)"""
+        with self._lock:
+            if not self._dirty:
+                return 0.0
+            oldest = min(since for _, since in self._dirty.values())
+        return time.time() - oldest
+
+    def stats(self):
+        """flush 카운터 및 지연 정보"""
+        return {
+            'pending': len(self._dirty),
+            'flushes': self.flush_count,
+            'writes': self.write_count,
+            'errors': self.error_count,
+            'lag_seconds': round(self.lag(), 3),
+            'last_flush_at': self.last_flush_at,
+            'last_flush_duration': round(self.last_flush_duration, 4)
+        }
+
+    def _ensure_started(self):
+        if self._task is None and self.socketio is not None:
+            self._task = self.socketio.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.interval)
+            self.flush()
+
+
+# write-behind 인스턴스 (전역)
+score_write_behind = ScoreWriteBehind()
@@ -0,0 +1,208 @@
+"""
+이벤트 루프(eventlet hub) 정지 감지기
+하트비트 greenlet이 짧은 주기로 깨어나며 예정보다 늦어진 시간(루프 지연)을 측정하고,
+별도의 네이티브 스레드가 하트비트가 멈춘 동안 hub 스레드의 스택을 캡처합니다.
+지연이 STALL_THRESHOLD_MS를 넘으면 당시 처리 중이던 핸들러/라우트와 스택을
+로그(STALL_LOG_PATH)에 남기고 /metrics, /health로 노출합니다.
+로그 경로에 {pid}가 있으면 워커별 파일을 직접 회전하고, 없으면 여러 워커가 같은 파일에
+이어 쓰도록 WatchedFileHandler를 사용하며 회전은 logrotate 등 외부에 맡깁니다.
+
+핸들러와 라우트는 함수 지역 변수 `_stall_activity`로 자신을 표시하며,
+감시 스레드는 캡처한 프레임을 거슬러 올라가 이 값을 찾습니다.
+"""
+import collections
+import logging
+import logging.handlers
+import os
+import sys
+import time
+import traceback
+
+from eventlet import patcher
+
+from app.utils.metrics import metrics
+
+ACTIVITY_LOCAL = '_stall_activity'
+
+# monkey patch와 무관한 네이티브 스레드/시간 함수 (감시 스레드 전용)
+_native_threading = patcher.original('threading')
+_native_thread = patcher.original('_thread')
+_native_time = patcher.original('time')
+
+
+def find_activity(frame):
+    """프레임 체인에서 가장 안쪽의 핸들러/라우트 표시를 찾음"""
+    while frame is not None:
+        activity = frame.f_locals.get(ACTIVITY_LOCAL)
+        if activity:
+            return activity
+        frame = frame.f_back
+    return None
+
+
+class StallCapture:
+    """정지 중 캡처한 hub 스레드 상태"""
+
+    __slots__ = ('beat', 'activity', 'stack', 'captured_at')
+
+    def __init__(self, beat, activity, stack):
+        self.beat = beat
+        self.activity = activity
+        self.stack = stack
+        self.captured_at = time.time()
+
+
+class StallDetector:
+    """hub 루프 지연 측정 및 정지 보고"""
+
+    def __init__(self):
+        self.socketio = None
+        self.enabled = True
+        self.heartbeat = 0.02
+        self.threshold = 0.1
+        self.logger = logging.getLogger('jungle_tetris.stalls')
+        self.recent = collections.deque(maxlen=20)
+        self._hub_thread_id = None
+        self._beat = 0
+        self._last_beat_at = None
+        self._capture = None
+        self._started = False
+        # 하트비트마다 갱신하므로 자식을 미리 받아 두고 속성만 갱신
+        self.lag = metrics.histogram(
+            'hub_loop_lag_seconds', 'Event loop heartbeat lateness',
+            (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+        ).labels()
+        self.stalls = metrics.counter('hub_stalls_total', 'Event loop stalls over the threshold by activity')
+        self.max_lag = metrics.gauge('hub_max_lag_seconds', 'Largest event loop lag observed').labels()
+
+    def init_app(self, app, socketio):
+        """앱 설정으로 초기화 후 라우트 표시 및 감시 시작"""
+        self.socketio = socketio
+        self.enabled = app.config.get('STALL_DETECTOR_ENABLED', True)
+        self.heartbeat = app.config.get('STALL_HEARTBEAT_MS', 20) / 1000.0
+        self.threshold = app.config.get('STALL_THRESHOLD_MS', 100) / 1000.0
+        if not self.enabled:
+            return
+
+        self._init_log(
+            self._resolve_log_path(app, app.config.get('STALL_LOG_PATH', 'logs/stalls.{pid}.log')),
+            app.config.get('STALL_LOG_MAX_BYTES', 5 * 1024 * 1024),
+            app.config.get('STALL_LOG_BACKUPS', 3)
+        )
+        self.mark_routes(app)
+        self.start()
+
+    @staticmethod
+    def _resolve_log_path(app, path):
+        """상대 경로는 실행 위치가 아닌 백엔드 루트(app 패키지의 상위) 기준으로 변환"""
+        if not path:
+            return None
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(app.root_path), path)
+        return path
+
+    def _init_log(self, path, max_bytes, backups):
+        if self.logger.handlers or not path:
+            return
+        per_process = '{pid}' in path
+        path = path.replace('{pid}', str(os.getpid()))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if per_process:
+            handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        else:
+            # 여러 프로세스가 한 파일을 회전하면 서로의 로그를 덮어쓰므로 회전은 외부에 맡김
+            handler = logging.handlers.WatchedFileHandler(path)
+        handler.setFormatter(logging.Formatter('%(asctime)s [%(process)d] %(message)s'))
+        self.logger.addHandler(handler)
+        self.logger.setLevel(logging.WARNING)
+
+    def mark_routes(self, app):
+        """등록된 뷰 함수마다 라우트 이름 표시를 추가"""
+        for endpoint, view in list(app.view_functions.items()):
+            app.view_functions[endpoint] = self._mark_view(endpoint, view)
+
+    @staticmethod
+    def _mark_view(endpoint, view):
+        activity = f"route:{endpoint}"
+
+        def marked(*args, **kwargs):
+            _stall_activity = activity  # noqa: F841 (감시 스레드가 프레임에서 읽음)
+            return view(*args, **kwargs)
+
+        marked.__name__ = view.__name__
+        marked.__doc__ = view.__doc__
+        marked.__wrapped__ = view
+        return marked
+
+    def start(self):
+        """하트비트 greenlet과 네이티브 감시 스레드 시작"""
+        if self._started:
+            return
+        self._started = True
+        self.socketio.start_background_task(self._heartbeat)
+        _native_threading.Thread(target=self._watch, name='hub-stall-watchdog', daemon=True).start()
+
+    def _heartbeat(self):
+        self._hub_thread_id = _native_thread.get_ident()
+        while True:
+            self._last_beat_at = _native_time.monotonic()
+            self.socketio.sleep(self.heartbeat)
+            now = _native_time.monotonic()
+            lag = max(0.0, now - self._last_beat_at - self.heartbeat)
+            self._beat += 1
+            self.lag.observe(lag)
+            if lag > self.max_lag.value:
+                self.max_lag.value = lag
+            if lag >= self.threshold:
+                self._report(lag)
+
+    def _watch(self):
+        """네이티브 스레드: 하트비트가 멈춰 있으면 hub 스레드 스택 캡처 (정지 1회당 1번)"""
+        interval = max(self.threshold / 2, 0.005)
+        while True:
+            _native_time.sleep(interval)
+            started = self._last_beat_at
+            if started is None or self._hub_thread_id is None:
+                continue
+            if _native_time.monotonic() - started < self.threshold:
+                continue
+            beat = self._beat
+            if self._capture is not None and self._capture.beat == beat:
+                continue
+            frame = sys._current_frames().get(self._hub_thread_id)
+            if frame is None:
+                continue
+            self._capture = StallCapture(beat, find_activity(frame), ''.join(traceback.format_stack(frame)))
+
+    def _report(self, lag):
+        """정지 기록 (하트비트 greenlet에서 호출되어 로그/메트릭 락을 안전하게 사용)"""
+        capture = self._capture
+        if capture is None or capture.beat != self._beat - 1:
+            capture = None
+        activity = capture.activity if capture and capture.activity else 'unknown'
+        self.stalls.inc(activity=activity)
+        self.recent.append({
+            'at': time.time(),
+            'lag_ms': round(lag * 1000, 1),
+            'activity': activity
+        })
+        self.logger.warning(
+            f"Event loop stalled {lag * 1000:.1f}ms in {activity}\n"
+            f"{capture.stack if capture else '(stack not captured)'}"
+        )
+
+    def stats(self):
+        """정지 감지 요약"""
+        return {
+            'enabled': self.enabled,
+            'threshold_ms': round(self.threshold * 1000, 1),
+            'stalls': sum(value for _, _, value in self.stalls.samples()),
+            'max_lag_ms': round(self.max_lag.value * 1000, 1),
+            'recent': list(self.recent)[-5:]
+        }
+
+
+# 정지 감지기 인스턴스 (전역)
+stall_detector = StallDetector()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+대전 부하 생성기
+봇 사용자를 /register 또는 /login으로 인증하고, /api/rooms/create + /api/rooms/join으로
+두 명씩 짝지은 뒤 실제 room:join -> game:score_update -> game:end 흐름을 실행합니다.
+점수 브로드캐스트 왕복 시간(내가 보낸 점수가 game:score_update로 돌아오기까지),
+소켓 연결 시간, 오류율을 p50/p95/p99로 보고하여 워커 하나가 지연 증가 없이
+감당하는 동시 방 수를 찾는 데 사용합니다.
+
+Socket.IO 클라이언트가 필요합니다: pip install "python-socketio[client]"
+
+사용법 (서버와 mongod를 로컬에서 실행한 상태로):
+    python -m benchmarks.load_versus --url http://localhost:8000 --rooms 50 --duration 60
+    python -m benchmarks.load_versus --rooms 200 --ramp 0.05 --json results.json
+"""
+import argparse
+import http.cookiejar
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import socketio
+
+BOT_PASSWORD = 'bot!1234'
+
+
+def _percentiles(values):
+    if not values:
+        return {'count': 0, 'p50': None, 'p95': None, 'p99': None, 'max': None}
+    ordered = sorted(values)
+
+    def at(ratio):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] * 1000, 2)
+
+    return {
+        'count': len(ordered),
+        'p50': at(0.5),
+        'p95': at(0.95),
+        'p99': at(0.99),
+        'max': round(ordered[-1] * 1000, 2)
+    }
+
+
+def _bot_name(index):
+    """이름 규칙(영문 2-10자)에 맞는 봇 이름"""
+    letters = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord('a') + rest) + letters
+    return ('Bot' + letters)[:10]
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Results:
+    """스레드 간 공유되는 측정 결과"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connect_times = []
+        self.score_rtts = []
+        self.end_times = []
+        self.errors = {}
+        self.matches_started = 0
+        self.matches_finished = 0
+        self.score_updates_sent = 0
+
+    def add(self, field, value):
+        with self.lock:
+            getattr(self, field).append(value)
+
+    def count(self, field, amount=1):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def error(self, kind):
+        with self.lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def summary(self, rooms, elapsed):
+        total_errors = sum(self.errors.values())
+        return {
+            'rooms': rooms,
+            'elapsed_seconds': round(elapsed, 2),
+            'matches_started': self.matches_started,
+            'matches_finished': self.matches_finished,
+            'score_updates_sent': self.score_updates_sent,
+            'connect_ms': _percentiles(self.connect_times),
+            'score_rtt_ms': _percentiles(self.score_rtts),
+            'game_end_ms': _percentiles(self.end_times),
+            'errors': dict(self.errors),
+            'error_rate': round(total_errors / max(1, self.score_updates_sent + 2 * rooms), 4)
+        }
+
+
+class Bot:
+    """HTTP 인증 + Socket.IO 연결을 가진 봇 사용자"""
+
+    def __init__(self, base_url, user_id, name, results, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.user_id = user_id
+        self.name = name
+        self.results = results
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect
+        )
+        self.sio = None
+        self.sent = {}  # 점수 -> 처음 보낸 시각 (소켓 수신 스레드와 공유)
+        self.sent_lock = threading.Lock()
+        self.seed = None
+        self.game_start = threading.Event()
+        self.game_end = threading.Event()
+
+    # HTTP
+    def _request(self, path, form=None, payload=None):
+        data, headers = None, {}
+        if form is not None:
+            data = urllib.parse.urlencode(form).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif payload is not None:
+            data = json.dumps(payload).encode()
+            headers['Content-Type'] = 'application/json'
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers, method='POST')
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            # 리다이렉트(302)와 4xx/5xx 모두 상태 코드로 반환
+            return e.code, e.read()
+
+    def _access_token(self):
+        for cookie in self.cookies:
+            if cookie.name == 'access_token':
+                return cookie.value
+        return None
+
+    def authenticate(self):
+        """로그인, 실패하면 회원가입 (둘 다 성공 시 access_token 쿠키 발급)"""
+        self._request('/login', form={'user_id': self.user_id, 'password': BOT_PASSWORD})
+        if self._access_token():
+            return True
+        self._request('/register', form={
+            'user_id': self.user_id,
+            'name': self.name,
+            'password': BOT_PASSWORD,
+            'password_confirm': BOT_PASSWORD
+        })
+        if self._access_token():
+            return True
+        self.results.error('auth')
+        return False
+
+    def create_room(self):
+        status, body = self._request('/api/rooms/create', payload={})
+        if status != 201:
+            self.results.error(f'room_create_{status}')
+            return None
+        return json.loads(body)['room_id']
+
+    def join_room(self, room_id):
+        status, _ = self._request('/api/rooms/join', payload={'room_id': room_id})
+        if status != 200:
+            self.results.error(f'room_join_{status}')
+            return False
+        return True
+
+    # Socket.IO
+    def connect(self):
+        self.sio = socketio.Client(reconnection=False)
+        self.sio.on('game:start', self._on_game_start)
+        self.sio.on('game:score_update', self._on_score_update)
+        self.sio.on('game:end', self._on_game_end)
+        self.sio.on('error', lambda data: self.results.error(f"socket_{(data or {}).get('type', 'unknown')}"))
+
+        started = time.perf_counter()
+        try:
+            self.sio.connect(
+                self.base_url,
+                headers={'Cookie': f'access_token={self._access_token()}'},
+                transports=['websocket'],
+                wait_timeout=self.timeout
+            )
+        except Exception:
+            self.results.error('connect')
+            return False
+        self.results.add('connect_times', time.perf_counter() - started)
+        return True
+
+    def _on_game_start(self, data):
+        self.seed = (data or {}).get('seed')
+        self.game_start.set()
+
+    def _on_score_update(self, data):
+        now = time.perf_counter()
+        for player in (data or {}).get('players', []):
+            if player.get('user_id') != self.user_id:
+                continue
+            # 틱 병합으로 중간 점수는 건너뛸 수 있으므로 돌아온 점수 이하를 모두 정리
+            score = player.get('score', 0)
+            with self.sent_lock:
+                sent_at = self.sent.pop(score, None)
+                for stale in [s for s in self.sent if s < score]:
+                    del self.sent[stale]
+            if sent_at is not None:
+                self.results.add('score_rtts', now - sent_at)
+
+    def _on_game_end(self, data):
+        if (data or {}).get('status') == 'finished':
+            self.game_end.set()
+
+    def mark_sent(self, score):
+        """점수를 처음 보낸 시각만 기록 (같은 점수 재전송으로 RTT가 짧아지지 않도록)"""
+        with self.sent_lock:
+            self.sent.setdefault(score, time.perf_counter())
+
+    def emit(self, event, data):
+        try:
+            self.sio.emit(event, data)
+            return True
+        except Exception:
+            self.results.error(f'emit_{event}')
+            return False
+
+    def close(self):
+        if self.sio is not None:
+            try:
+                self.sio.disconnect()
+            except Exception:
+                pass
+
+
+def play_match(index, args, results):
+    """봇 두 명으로 대전 한 판 실행"""
+    host = Bot(args.url, f'{args.prefix}{index * 2}', _bot_name(index * 2), results, args.timeout)
+    guest = Bot(args.url, f'{args.prefix}{index * 2 + 1}', _bot_name(index * 2 + 1), results, args.timeout)
+    try:
+        if not (host.authenticate() and guest.authenticate()):
+            return
+        room_id = host.create_room()
+        if not room_id or not host.connect():
+            return
+        host.emit('room:join', {'room_id': room_id})
+        if not guest.join_room(room_id) or not guest.connect():
+            return
+        guest.emit('room:join', {'room_id': room_id})
+
+        if not (host.game_start.wait(args.timeout) and guest.game_start.wait(args.timeout)):
+            results.error('game_start_timeout')
+            return
+        results.count('matches_started')
+
+        # 일정 주기로 점수 전송 (실제 플레이처럼 매번 증가하지는 않음)
+        bots = (host, guest)
+        scores = [0, 0]
+        deadline = time.perf_counter() + args.duration
+        tick = 0
+        while time.perf_counter() < deadline:
+            for i, bot in enumerate(bots):
+                if (tick + i) % 2 == 0:
+                    scores[i] += 100
+                bot.mark_sent(scores[i])
+                if bot.emit('game:score_update', {'room_id': room_id, 'score': scores[i]}):
+                    results.count('score_updates_sent')
+            tick += 1
+            time.sleep(args.score_interval)
+
+        # 최종 점수는 리플레이로 검증되므로 입력 없이(중력 낙하만) 끝난 게임으로 제출
+        started = time.perf_counter()
+        for bot in bots:
+            bot.emit('game:end', {'room_id': room_id, 'score': 0, 'replay': {'seed': bot.seed, 'inputs': []}})
+        if all(bot.game_end.wait(args.timeout) for bot in bots):
+            results.add('end_times', time.perf_counter() - started)
+            results.count('matches_finished')
+        else:
+            results.error('game_end_timeout')
+    except Exception:
+        results.error('exception')
+    finally:
+        host.close()
+        guest.close()
+
+
+def run(args):
+    """방 args.rooms개를 args.ramp초 간격으로 시작하고 모두 끝나면 요약 반환"""
+    results = Results()
+    threads = []
+    started = time.perf_counter()
+    for index in range(args.rooms):
+        thread = threading.Thread(target=play_match, args=(index, args, results), daemon=True)
+        thread.start()
+        threads.append(thread)
+        time.sleep(args.ramp)
+    for thread in threads:
+        thread.join()
+    return results.summary(args.rooms, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대전 부하 생성기')
+    parser.add_argument('--url', default='http://localhost:8000', help='서버 주소')
+    parser.add_argument('--rooms', type=int, default=10, help='동시 대전 방 수 (봇은 2배)')
+    parser.add_argument('--duration', type=float, default=60, help='대전 시간 (초)')
+    parser.add_argument('--score-interval', type=float, default=0.2, help='봇별 점수 전송 주기 (초)')
+    parser.add_argument('--ramp', type=float, default=0.1, help='방 시작 간격 (초)')
+    parser.add_argument('--timeout', type=float, default=15, help='HTTP/소켓 대기 제한 시간 (초)')
+    parser.add_argument('--prefix', default='loadbot', help='봇 아이디 접두사 (영문/숫자)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    summary = run(args)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    print(f"🏠 rooms: {summary['rooms']} (started {summary['matches_started']}, finished {summary['matches_finished']})")
+    for label, key in (('connect', 'connect_ms'), ('score rtt', 'score_rtt_ms'), ('game:end', 'game_end_ms')):
+        p = summary[key]
+        print(f"⏱️  {label}: n={p['count']} p50={p['p50']}ms p95={p['p95']}ms p99={p['p99']}ms max={p['max']}ms")
+    print(f"❌ errors: {summary['errors'] or 0} (rate {summary['error_rate']:.2%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+로그인 처리량 벤치마크
+여러 클라이언트 greenlet이 동시에 비밀번호 검증을 요청할 때의 처리량/지연과,
+그동안 이벤트 루프가 얼마나 멈추는지(하트비트 지연)를 함께 측정합니다.
+
+사용법:
+    python -m benchmarks.login --clients 50 --requests 200 --rounds 12 --concurrency 4
+    python -m benchmarks.login --inline   # monkey patch 없이 루프 위에서 직접 검증 (비교용)
+"""
+import sys
+
+import eventlet
+
+INLINE = '--inline' in sys.argv
+if not INLINE:
+    eventlet.monkey_patch()
+
+import argparse
+import statistics
+import time
+
+from app.utils.password_hasher import PasswordHasher, _bcrypt_hash
+
+HEARTBEAT_INTERVAL = 0.01
+
+
+def _percentile(values, ratio):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def run(clients, requests, rounds, concurrency, password='tetris!123'):
+    """벤치마크 실행 후 결과 반환"""
+    hasher = PasswordHasher()
+    hasher.configure(rounds, concurrency, queue_timeout=60.0)
+    hashed = _bcrypt_hash(password, rounds)
+
+    latencies = []
+    stalls = []
+    remaining = [requests]
+    running = [True]
+
+    def heartbeat():
+        # 이벤트 루프가 멈추면 예정보다 늦게 깨어나므로 그 초과분을 기록
+        while running[0]:
+            expected = time.perf_counter() + HEARTBEAT_INTERVAL
+            eventlet.sleep(HEARTBEAT_INTERVAL)
+            stalls.append(max(0.0, time.perf_counter() - expected))
+
+    def client():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            started = time.perf_counter()
+            assert hasher.verify(hashed, password)
+            latencies.append(time.perf_counter() - started)
+
+    beat = eventlet.spawn(heartbeat)
+    started = time.perf_counter()
+    pool = eventlet.GreenPool(clients)
+    for _ in range(clients):
+        pool.spawn(client)
+    pool.waitall()
+    elapsed = time.perf_counter() - started
+    running[0] = False
+    beat.wait()
+
+    return {
+        'requests': len(latencies),
+        'elapsed': elapsed,
+        'logins_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'latency_p50': _percentile(latencies, 0.5),
+        'latency_p95': _percentile(latencies, 0.95),
+        'stall_max': max(stalls) if stalls else elapsed,
+        'stall_mean': statistics.mean(stalls) if stalls else elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로그인(비밀번호 검증) 처리량 벤치마크')
+    parser.add_argument('--clients', type=int, default=50, help='동시 클라이언트 수')
+    parser.add_argument('--requests', type=int, default=200, help='전체 로그인 요청 수')
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt 라운드 (BCRYPT_LOG_ROUNDS)')
+    parser.add_argument('--concurrency', type=int, default=4, help='동시 해싱 수 (PASSWORD_HASH_CONCURRENCY)')
+    parser.add_argument('--inline', action='store_true', help='monkey patch 없이 이벤트 루프에서 직접 검증')
+    args = parser.parse_args()
+
+    result = run(args.clients, args.requests, args.rounds, args.concurrency)
+    print(f"🔐 mode: {'inline' if INLINE else 'tpool'} (rounds={args.rounds}, concurrency={args.concurrency})")
+    print(f"⏱️  elapsed: {result['elapsed']:.3f}s")
+    print(f"🚀 logins/s: {result['logins_per_second']:,.1f}")
+    print(f"📊 latency p50/p95: {result['latency_p50'] * 1000:.1f}ms / {result['latency_p95'] * 1000:.1f}ms")
+    print(f"💓 event loop stall max/mean: {result['stall_max'] * 1000:.1f}ms / {result['stall_mean'] * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
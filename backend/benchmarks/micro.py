@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+소켓 핸들러/모델 마이크로 벤치마크
+앱을 프로세스 안에서 만들고 Flask-SocketIO 테스트 클라이언트로 핸들러를 직접 호출하며,
+모델 변환과 GameRecord.save를 로컬 MongoDB(벤치마크 전용 DB)에 대해 측정합니다.
+결과는 JSON으로 저장하고, 저장해 둔 기준값(baseline)과 중앙값을 비교하여
+허용 범위(--tolerance)를 넘게 느려진 항목이 있으면 종료 코드 1을 반환합니다.
+
+사용법 (mongod를 로컬에서 실행한 상태로):
+    python -m benchmarks.micro --json baseline.json                       # 기준값 저장
+    python -m benchmarks.micro --baseline baseline.json --tolerance 0.2   # 배포 전 비교
+    python -m benchmarks.micro --only socket.   # 이름이 socket.으로 시작하는 항목만
+"""
+import eventlet
+
+eventlet.monkey_patch()
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+DEFAULT_MONGODB_URI = 'mongodb://localhost:27017/jungle_tetris_bench'
+BENCH_PREFIX = 'benchuser'
+BENCH_HASH = 'bench-password-hash'  # 비밀번호 검증은 측정 대상이 아님
+
+
+def measure(fn, number, repeat, warmup):
+    """warmup 후 number회씩 repeat번 실행한 호출당 시간(마이크로초) 통계"""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - started) / number * 1e6)
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min_us': round(min(timings), 3),
+        'median_us': round(statistics.median(timings), 3),
+        'mean_us': round(statistics.mean(timings), 3),
+        'max_us': round(max(timings), 3)
+    }
+
+
+class Fixture:
+    """벤치마크용 사용자/방/소켓 클라이언트 준비 및 정리"""
+
+    def __init__(self, app, socketio):
+        from app.models.game_room import GameRoom
+        from app.models.user import User
+        from app.utils.room_registry import room_registry
+
+        self.app = app
+        self.socketio = socketio
+        self.users = [
+            User(f'{BENCH_PREFIX}{i}', f'Bench{chr(ord("a") + i)}', hashed_password=BENCH_HASH)
+            for i in range(2)
+        ]
+        for user in self.users:
+            user.save()
+        self.room = GameRoom(
+            host_user_id=self.users[0].user_id,
+            host_name=self.users[0].name,
+            status='playing',
+            participants=[
+                {'user_id': user.user_id, 'name': user.name, 'joined_at': datetime.utcnow(),
+                 'score': 0, 'status': 'ready'}
+                for user in self.users
+            ]
+        )
+        self.room.save()
+        room_registry.register(self.room)
+
+        with app.app_context():
+            from flask_jwt_extended import create_access_token
+            self.token = create_access_token(identity=self.users[0].user_id)
+        self.client = self.connect()
+        self.client.get_received()
+
+    def connect(self):
+        return self.socketio.test_client(self.app, auth={'token': self.token})
+
+    def drain(self):
+        """티커 브로드캐스트가 쌓이지 않도록 받은 메시지 비우기"""
+        self.client.get_received()
+
+    def cleanup(self):
+        from app.utils.database import get_db
+        from app.utils.room_registry import room_registry
+
+        self.client.disconnect()
+        room_registry.evict(self.room.room_id)
+        db = get_db()
+        db.users.delete_many({'user_id': {'$in': [user.user_id for user in self.users]}})
+        db.game_rooms.delete_one({'room_id': self.room.room_id})
+        db.game_records.delete_many({'room_id': self.room.room_id})
+
+
+def build_cases(fixture):
+    """측정 항목 [(이름, 호출 함수, DB/소켓 I/O 여부)]"""
+    from app.engine.pieces import ROWS
+    from app.models.game_record import GameRecord
+    from app.models.user import User
+
+    user_doc = fixture.users[0].to_mongodb_doc()
+    room_id = fixture.room.room_id
+    players = [{'user_id': user.user_id, 'name': user.name, 'score': 1000} for user in fixture.users]
+    score = [0]
+    board = [0] * ROWS
+
+    def score_update():
+        score[0] += 10
+        fixture.client.emit('game:score_update', {'room_id': room_id, 'score': score[0]})
+        fixture.drain()
+
+    def board_update():
+        board[-1] = (board[-1] + 1) % 1024
+        fixture.client.emit('game:board_update', {'room_id': room_id, 'rows': board})
+        fixture.drain()
+
+    def connect():
+        fixture.connect().disconnect()
+
+    def record_save():
+        GameRecord(
+            room_id=room_id, game_type='multiplayer', players=players,
+            winner_id=players[0]['user_id'], duration=60
+        ).save()
+
+    return [
+        ('model.user_from_mongodb_doc', lambda: User.from_mongodb_doc(user_doc), False),
+        ('model.user_to_mongodb_doc', fixture.users[0].to_mongodb_doc, False),
+        ('model.room_to_dict', fixture.room.to_dict, False),
+        ('model.record_save', record_save, True),
+        ('socket.connect', connect, True),
+        ('socket.score_update', score_update, True),
+        ('socket.board_update', board_update, True)
+    ]
+
+
+def compare(results, baseline, tolerance):
+    """기준값 대비 중앙값 변화율 (허용 범위를 넘으면 regression)"""
+    report = {}
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base or not base.get('median_us'):
+            report[name] = {'status': 'new'}
+            continue
+        change = result['median_us'] / base['median_us'] - 1
+        report[name] = {
+            'baseline_us': base['median_us'],
+            'change': round(change, 4),
+            'status': 'regression' if change > tolerance else 'ok'
+        }
+    return report
+
+
+def run(args):
+    """앱을 만들고 모든 항목을 측정한 결과 반환"""
+    from app import create_app, socketio
+
+    app = create_app()
+    fixture = Fixture(app, socketio)
+    try:
+        results = {}
+        for name, fn, io in build_cases(fixture):
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            results[name] = measure(fn, args.io_number if io else args.number, args.repeat, args.warmup)
+    finally:
+        fixture.cleanup()
+    return {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mongodb_uri': os.environ['MONGODB_URI']
+        },
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='소켓 핸들러/모델 마이크로 벤치마크')
+    parser.add_argument('--mongodb-uri', default=os.getenv('BENCH_MONGODB_URI', DEFAULT_MONGODB_URI),
+                        help='벤치마크용 MongoDB (운영 DB와 분리)')
+    parser.add_argument('--number', type=int, default=10000, help='메모리 항목의 반복당 호출 수')
+    parser.add_argument('--io-number', type=int, default=200, help='DB/소켓 항목의 반복당 호출 수')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (중앙값 비교)')
+    parser.add_argument('--warmup', type=int, default=50, help='측정 전 호출 수')
+    parser.add_argument('--only', action='append', help='이 접두사로 시작하는 항목만 측정 (여러 번 지정 가능)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--baseline', help='비교할 기준값 JSON 파일 경로')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='허용 변화율 (0.2 = 20%% 느려짐까지 허용)')
+    args = parser.parse_args()
+
+    # Config가 import 시점에 환경 변수를 읽으므로 앱 import 전에 지정
+    os.environ['MONGODB_URI'] = args.mongodb_uri
+    # 하트비트 greenlet이 측정 중 끼어들지 않도록 정지 감지기는 기본으로 끔
+    os.environ.setdefault('STALL_DETECTOR_ENABLED', 'false')
+
+    summary = run(args)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            summary['comparison'] = compare(summary['results'], json.load(f), args.tolerance)
+        regressions = [name for name, item in summary['comparison'].items() if item['status'] == 'regression']
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    for name, result in summary['results'].items():
+        line = f"⏱️  {name:<30} median {result['median_us']:>10.2f}us  min {result['min_us']:>10.2f}us"
+        item = summary.get('comparison', {}).get(name)
+        if item and 'change' in item:
+            line += f"  ({item['change']:+.1%} vs baseline{' ❌' if item['status'] == 'regression' else ''})"
+        print(line)
+    if regressions:
+        print(f"❌ regressions over {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
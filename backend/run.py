@@ -4,6 +4,10 @@ Jungle Tetris Backend Server
 실시간 대전 테트리스 게임 백엔드 서버
 """
 
+# PyMongo 등 블로킹 소켓 I/O가 greenlet 전환을 일으키도록 다른 import보다 먼저 패치
+import eventlet
+eventlet.monkey_patch()
+
 import os
 from dotenv import load_dotenv
 from app import create_app, socketio